@@ -0,0 +1,78 @@
+"""Compare the NumPy-only engine with the pickled sklearn pipeline.
+
+Checks that both engines agree on every row of dataset.csv and measures, in
+fresh interpreters, the time to import ai.predict (which loads the active
+model) and the resulting peak RSS.
+
+Run from the backend directory after ``python -m ai.train_model --export-only``:
+
+    python -m ai.bench_compact
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PROBE = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+from ai.predict import registry, predict_department
+registry.ensure_loaded()
+load_s = time.perf_counter() - t0
+predict_department("loud music from the bar next door")
+try:
+    # VmHWM belongs to this exec'd image; ru_maxrss can carry the parent's peak
+    with open("/proc/self/status") as f:
+        peak = next(int(l.split()[1]) for l in f if l.startswith("VmHWM")) / 1024
+except OSError:
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+print(json.dumps({
+    "engine": registry.active.engine,
+    "import_and_load_s": load_s,
+    "peak_rss_mb": peak,
+    "sklearn_imported": "sklearn" in sys.modules,
+}))
+"""
+
+
+def probe(engine, runs=5):
+    env = {**os.environ, "MODEL_ENGINE": engine, "PYTHONWARNINGS": "ignore"}
+    results = [
+        json.loads(subprocess.run(
+            [sys.executable, "-c", PROBE], cwd=BASE_DIR.parent, env=env,
+            capture_output=True, text=True, check=True,
+        ).stdout)
+        for _ in range(runs)
+    ]
+    best = min(results, key=lambda r: r["import_and_load_s"])
+    best["peak_rss_mb"] = float(np.median([r["peak_rss_mb"] for r in results]))
+    return best
+
+
+def parity(tolerance=1e-4):
+    import joblib
+    from .compact import CompactModel
+
+    pipe = joblib.load(BASE_DIR / "department_model.pkl")
+    compact = CompactModel(BASE_DIR / "department_model.npmodel")
+    texts = pd.read_csv(BASE_DIR / "dataset.csv")["description"].dropna().astype(str).tolist()
+
+    same = np.mean(pipe.predict(texts) == compact.predict(texts))
+    max_diff = np.abs(pipe.decision_function(texts) - compact.decision_function(texts)).max()
+    print(f"Parity on {len(texts)} rows: {same:.2%} identical labels, max score diff {max_diff:.2e}")
+    assert max_diff < tolerance, "NumPy engine diverges from the sklearn pipeline"
+
+
+if __name__ == "__main__":
+    for engine in ("sklearn", "numpy"):
+        r = probe(engine)
+        print(f"{r['engine']:>8}: import+load {r['import_and_load_s'] * 1000:7.1f} ms, "
+              f"peak RSS {r['peak_rss_mb']:6.1f} MB, sklearn imported: {r['sklearn_imported']}")
+    parity()
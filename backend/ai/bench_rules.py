@@ -0,0 +1,76 @@
+"""Micro-benchmark: compiled rule matcher vs. the legacy per-category scans.
+
+Run from the backend directory:
+
+    python -m ai.bench_rules
+"""
+import random
+import string
+import timeit
+
+from .rules import RULES, compile_rules
+
+
+def legacy_match(rules):
+    """The original implementation: one any(word in text) scan per category."""
+    def match(description_lower: str):
+        for r in rules:
+            if any(word in description_lower for word in r["keywords"]):
+                return r["category"], r["department"], r["summary"]
+        return None
+    return match
+
+
+def synthetic_rules(n_keywords, per_rule=10, seed=42):
+    """Pad the real rule table with random keywords up to n_keywords in total."""
+    rng = random.Random(seed)
+    rules = [dict(r) for r in RULES]
+    total = sum(len(r["keywords"]) for r in rules)
+    i = 0
+    while total < n_keywords:
+        words = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10)))
+            for _ in range(min(per_rule, n_keywords - total))
+        ]
+        rules.append({
+            "category": f"Synthetic {i}",
+            "department": "General Administration",
+            "summary": "Synthetic rule",
+            "keywords": words,
+        })
+        total += len(words)
+        i += 1
+    return rules
+
+
+SAMPLES = [
+    "There is water leakage near main road for 3 days",
+    "Loud music from the neighbours every night after midnight",
+    "Garbage has not been collected from our street this week",
+    "Car parked across my driveway, cannot get out to go to work",
+    "Graffiti sprayed on the wall of the community centre near the park entrance",
+]
+
+
+def run(n_keywords, repeat=5, number=2000):
+    rules = synthetic_rules(n_keywords)
+    texts = [s.lower() for s in SAMPLES]
+    legacy = legacy_match(rules)
+    compiled = compile_rules(rules)
+
+    for text in texts:
+        assert legacy(text) == compiled(text), text
+
+    def bench(fn):
+        t = min(timeit.repeat(lambda: [fn(x) for x in texts], repeat=repeat, number=number))
+        return t / (number * len(texts)) * 1e6
+
+    legacy_us = bench(legacy)
+    compiled_us = bench(compiled)
+    print(f"{n_keywords:>6} keywords | legacy {legacy_us:8.2f} us/call | "
+          f"compiled {compiled_us:8.2f} us/call | speedup {legacy_us / compiled_us:5.2f}x")
+
+
+if __name__ == "__main__":
+    for n in (16, 100, 500, 1000):
+        run(n)
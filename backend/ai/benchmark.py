@@ -0,0 +1,230 @@
+"""Benchmark and evaluation harness for the department classifier.
+
+Run from the backend directory:
+
+    python -m ai.benchmark                       # current artifacts + candidate configs
+    python -m ai.benchmark --skip-candidates --out results.json
+    python -m ai.benchmark --baseline old.json   # flag regressions against a previous run
+
+For every model it reports load time, artifact size, single-call latency
+percentiles on the rule and ML paths, batch throughput, and accuracy/F1 on the
+same stratified 80/20 split train_model.py uses. Results are written as JSON.
+"""
+import argparse
+import hashlib
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+
+from .predict import _classify, _classify_batch, registry
+from .rules import match_rules
+
+BASE_DIR = Path(__file__).resolve().parent
+CSV_PATH = BASE_DIR / "dataset.csv"
+MIN_SAMPLES = 20
+
+# Candidate configurations trained on the train split and compared side by side
+CANDIDATES = {
+    "tfidf_bigram_logreg": lambda: make_pipeline(
+        TfidfVectorizer(max_features=20000, ngram_range=(1, 2)),
+        LogisticRegression(max_iter=1000),
+    ),
+    "tfidf_unigram_logreg": lambda: make_pipeline(
+        TfidfVectorizer(max_features=20000),
+        LogisticRegression(max_iter=1000),
+    ),
+    "hashing_sgd": lambda: make_pipeline(
+        HashingVectorizer(n_features=2 ** 20, ngram_range=(1, 2), alternate_sign=False),
+        SGDClassifier(loss="log_loss", alpha=1e-6, random_state=42),
+    ),
+}
+
+# Higher is better for these; everything else (latencies, sizes) lower is better
+HIGHER_IS_BETTER = {"accuracy", "f1_macro", "f1_weighted", "batch_rows_per_s"}
+
+
+def load_split(csv_path):
+    df = pd.read_csv(csv_path)[["description", "complaint_type"]].dropna()
+    counts = df["complaint_type"].value_counts()
+    df = df[df["complaint_type"].isin(counts[counts >= MIN_SAMPLES].index)]
+    X = df["description"].astype(str)
+    y = df["complaint_type"].astype(str)
+    return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+
+def percentiles(samples_s):
+    ms = np.asarray(samples_s) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p95_ms": round(float(np.percentile(ms, 95)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+    }
+
+
+def time_calls(fn, inputs, repeat):
+    timings = []
+    for _ in range(repeat):
+        for x in inputs:
+            t0 = time.perf_counter()
+            fn(x)
+            timings.append(time.perf_counter() - t0)
+    return timings
+
+
+def bench_rules(texts, repeat):
+    """The keyword rule stage on its own, plus its hit rate on the dataset"""
+    lowered = [t.lower() for t in texts]
+    hits = sum(match_rules(t) is not None for t in lowered)
+    return {
+        "hit_rate": round(hits / len(lowered), 4),
+        **percentiles(time_calls(match_rules, lowered[:500], repeat)),
+    }
+
+
+def bench_model(name, path, X_test, y_test, repeat, batch_size):
+    t0 = time.perf_counter()
+    model = joblib.load(path)
+    load_s = time.perf_counter() - t0
+
+    texts = list(X_test)
+    rule_texts = [t for t in texts if match_rules(t.lower())][:200] or ["water leak on main road"]
+    ml_texts = [t for t in texts if not match_rules(t.lower())][:200]
+
+    # First call pays one-off costs; keep it out of the percentiles
+    model.predict(ml_texts[:1] or rule_texts[:1])
+
+    batch = (texts * (batch_size // max(len(texts), 1) + 1))[:batch_size]
+    t0 = time.perf_counter()
+    _classify_batch(batch, model)
+    batch_s = time.perf_counter() - t0
+
+    y_pred = model.predict(texts)
+    return {
+        "name": name,
+        "artifact": str(path),
+        "version": hashlib.sha256(Path(path).read_bytes()).hexdigest()[:12],
+        "artifact_bytes": Path(path).stat().st_size,
+        "load_s": round(load_s, 4),
+        "rule_path": percentiles(time_calls(lambda t: _classify(t, model), rule_texts, repeat)),
+        # None when every held-out row is answered by a rule
+        "ml_path": percentiles(time_calls(lambda t: _classify(t, model), ml_texts, repeat)) if ml_texts else None,
+        "batch_rows_per_s": round(batch_size / batch_s, 1),
+        "accuracy": round(accuracy_score(y_test, y_pred), 4),
+        "f1_macro": round(f1_score(y_test, y_pred, average="macro", zero_division=0), 4),
+        "f1_weighted": round(f1_score(y_test, y_pred, average="weighted", zero_division=0), 4),
+    }
+
+
+def flatten(result, prefix=""):
+    flat = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(results, baseline_path, tolerance):
+    """Print metrics that got worse than the baseline by more than tolerance"""
+    baseline = {m["name"]: flatten(m) for m in json.loads(Path(baseline_path).read_text())["models"]}
+    regressions = 0
+    for model in results["models"]:
+        old = baseline.get(model["name"])
+        if old is None:
+            continue
+        for metric, value in flatten(model).items():
+            before = old.get(metric)
+            if not before:
+                continue
+            change = (value - before) / abs(before)
+            worse = change < -tolerance if metric.split(".")[-1] in HIGHER_IS_BETTER else change > tolerance
+            if worse:
+                regressions += 1
+                print(f"REGRESSION {model['name']} {metric}: {before} -> {value} ({change:+.1%})")
+    print(f"{regressions} regression(s) against {baseline_path}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", type=Path, default=CSV_PATH)
+    parser.add_argument("--models", type=Path, nargs="*",
+                        help="artifacts to evaluate (default: every registered version)")
+    parser.add_argument("--skip-candidates", action="store_true", help="do not train candidate configs")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions for latency sampling")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--out", type=Path, default=Path("ai_benchmark.json"))
+    parser.add_argument("--baseline", type=Path, help="previous results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative change")
+    args = parser.parse_args()
+
+    X_train, X_test, y_train, y_test = load_split(args.csv)
+    print(f"Split: {len(X_train)} train / {len(X_test)} held-out rows")
+
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sklearn": sklearn.__version__,
+        "dataset": str(args.csv),
+        "rules": bench_rules(list(X_test), args.repeat),
+        "models": [],
+    }
+
+    paths = args.models
+    if paths is None:
+        paths = [registry.default_path] + sorted(registry.base_dir.glob(f"{registry.prefix}*.pkl"))
+    for path in paths:
+        print(f"Evaluating {path.name}")
+        results["models"].append(
+            bench_model(path.name, path, X_test, y_test, args.repeat, args.batch_size)
+        )
+
+    if not args.skip_candidates:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, build in CANDIDATES.items():
+                print(f"Training candidate {name}")
+                pipe = build()
+                t0 = time.perf_counter()
+                pipe.fit(X_train, y_train)
+                fit_s = time.perf_counter() - t0
+                if isinstance(pipe[-1], SGDClassifier):
+                    pipe[-1].sparsify()  # as train_model.py --streaming does
+                path = Path(tmp) / f"{name}.pkl"
+                joblib.dump(pipe, path)
+                result = bench_model(name, path, X_test, y_test, args.repeat, args.batch_size)
+                result["fit_s"] = round(fit_s, 3)
+                result["artifact"] = None
+                results["models"].append(result)
+
+    print(f"\nRule stage: hit rate {results['rules']['hit_rate']:.1%}, p50 {results['rules']['p50_ms']} ms")
+    print(f"{'model':<32}{'acc':>7}{'f1':>7}{'load s':>8}{'MB':>8}{'rule p99':>10}{'ml p50':>8}{'ml p99':>8}{'rows/s':>10}")
+    for m in results["models"]:
+        ml = f"{m['ml_path']['p50_ms']:>8.3f}{m['ml_path']['p99_ms']:>8.3f}" if m["ml_path"] else f"{'-':>8}{'-':>8}"
+        print(f"{m['name'][:31]:<32}{m['accuracy']:>7.3f}{m['f1_macro']:>7.3f}{m['load_s']:>8.3f}"
+              f"{m['artifact_bytes'] / 1e6:>8.2f}{m['rule_path']['p99_ms']:>10.3f}"
+              f"{ml}{m['batch_rows_per_s']:>10.0f}")
+
+    args.out.write_text(json.dumps(results, indent=2))
+    print(f"\nWrote {args.out}")
+
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
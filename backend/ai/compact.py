@@ -0,0 +1,130 @@
+"""Compact, NumPy-only inference for the TF-IDF + linear department model.
+
+``export_pipeline`` (used by train_model.py) writes a directory:
+
+    meta.json      tokenizer settings, vocabulary, classes, source version
+    idf.npy        float32 IDF weights, one per vocabulary term
+    coef.npy       float32 weights, shape (n_features, n_classes)
+    intercept.npy  float32 intercepts
+
+``CompactModel`` loads it without scikit-learn. The weight arrays are memory
+mapped read-only, so every worker process on a host shares the same pages.
+"""
+import json
+import re
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+FORMAT_VERSION = 1
+SUFFIX = ".npmodel"
+
+
+def export_pipeline(pipe, out_dir, source_version=None):
+    """Write a fitted make_pipeline(TfidfVectorizer, linear classifier) to out_dir"""
+    vectorizer, clf = pipe[0], pipe[-1]
+    params = vectorizer.get_params()
+    if params["analyzer"] != "word" or params["tokenizer"] or params["preprocessor"] \
+            or params["strip_accents"] or not hasattr(vectorizer, "idf_"):
+        raise ValueError("Only word-analyzer TfidfVectorizer pipelines can be exported")
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    coef = clf.coef_
+    coef = coef.toarray() if hasattr(coef, "toarray") else np.asarray(coef)
+    # Resolved list ("english" or a custom one); removed before n-grams are built
+    stop_words = vectorizer.get_stop_words()
+
+    meta = {
+        "format": FORMAT_VERSION,
+        "source_version": source_version,
+        "lowercase": params["lowercase"],
+        "token_pattern": params["token_pattern"],
+        "ngram_range": list(params["ngram_range"]),
+        "binary": params["binary"],
+        "sublinear_tf": params["sublinear_tf"],
+        "norm": params["norm"],
+        "stop_words": sorted(stop_words) if stop_words else None,
+        "vocabulary": {term: int(i) for term, i in vectorizer.vocabulary_.items()},
+        "classes": [str(c) for c in clf.classes_],
+    }
+    (out_dir / "meta.json").write_text(json.dumps(meta))
+    np.save(out_dir / "idf.npy", vectorizer.idf_.astype(np.float32))
+    np.save(out_dir / "coef.npy", np.ascontiguousarray(coef.T, dtype=np.float32))
+    np.save(out_dir / "intercept.npy", np.asarray(clf.intercept_, dtype=np.float32))
+    return out_dir
+
+
+class CompactModel:
+    """Duck-types the ``predict`` of the sklearn pipeline it was exported from"""
+
+    def __init__(self, path):
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        if meta["format"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact model format {meta['format']}")
+
+        self.source_version = meta["source_version"]
+        self.lowercase = meta["lowercase"]
+        self.token_re = re.compile(meta["token_pattern"])
+        self.min_n, self.max_n = meta["ngram_range"]
+        self.binary = meta["binary"]
+        self.sublinear_tf = meta["sublinear_tf"]
+        self.norm = meta["norm"]
+        self.stop_words = frozenset(meta.get("stop_words") or ())
+        self.vocabulary = meta["vocabulary"]
+        self.classes_ = np.array(meta["classes"], dtype=object)
+
+        self.idf = np.load(path / "idf.npy", mmap_mode="r")
+        self.coef = np.load(path / "coef.npy", mmap_mode="r")
+        self.intercept = np.load(path / "intercept.npy")
+
+    def _features(self, text):
+        """Vocabulary indices and TF-IDF values, matching TfidfVectorizer.transform"""
+        if self.lowercase:
+            text = text.lower()
+        tokens = self.token_re.findall(text)
+        if self.stop_words:
+            tokens = [t for t in tokens if t not in self.stop_words]
+
+        counts = Counter()
+        vocabulary = self.vocabulary
+        for n in range(self.min_n, self.max_n + 1):
+            for i in range(len(tokens) - n + 1):
+                index = vocabulary.get(" ".join(tokens[i:i + n]))
+                if index is not None:
+                    counts[index] += 1
+
+        if not counts:
+            return None, None
+        indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        if self.binary:
+            values[:] = 1.0
+        elif self.sublinear_tf:
+            values = np.log(values) + 1.0
+        values *= self.idf[indices]
+        if self.norm == "l2":
+            values /= np.sqrt(np.dot(values, values))
+        elif self.norm == "l1":
+            values /= np.abs(values).sum()
+        return indices, values
+
+    def decision_function(self, texts):
+        scores = np.empty((len(texts), self.coef.shape[1]), dtype=np.float32)
+        for row, text in enumerate(texts):
+            indices, values = self._features(text)
+            if indices is None:
+                scores[row] = self.intercept
+            else:
+                scores[row] = values @ self.coef[indices] + self.intercept
+        return scores
+
+    def predict(self, texts):
+        scores = self.decision_function(texts)
+        if scores.shape[1] == 1:
+            # Binary linear models store a single weight vector for classes_[1]
+            return self.classes_[(scores[:, 0] > 0).astype(int)]
+        return self.classes_[scores.argmax(axis=1)]
@@ -1,43 +1,155 @@
-import joblib
+import logging
+import os
+import time
 from pathlib import Path
 from .department_mapping import map_to_department
+from .rules import match_rules
+from .cache import PredictionCache, normalize_description
+from .registry import ModelRegistry
+
+logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent
 MODEL_PATH = BASE_DIR / "department_model.pkl"
 
-try:
-    model = joblib.load(MODEL_PATH)
-except:
-    model = None
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "3600"))
 
-def predict_department(description: str):
-    """Predict complaint type and generate AI summary"""
-    
+prediction_cache = PredictionCache(maxsize=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL)
+
+registry = ModelRegistry(
+    BASE_DIR,
+    default_name=MODEL_PATH.name,
+    on_swap=lambda loaded: prediction_cache.bind(loaded.version),
+)
+# The model is loaded on first use, or ahead of traffic by registry.warm_up()
+
+# Optional instrumentation hook, set by the API (see app/core/metrics.py).
+# observer.stage(stage, seconds) times the "rules" and "model" stages of each
+# call; observer.results(path, count) counts predictions by the path that
+# produced them: "cache", "rule", "ml" or "default". observer.model_error(version)
+# counts model.predict calls that raised (their rows fall back to the default).
+observer = None
+
+
+def active_model():
+    """Snapshot of the active model; pass it to the predict functions to pin a version"""
+    registry.ensure_loaded()
+    registry.poll()
+    return registry.active
+
+
+def _from_complaint_type(complaint_type: str):
+    department = map_to_department(complaint_type)
+    summary = f"Complaint classified as {complaint_type}"
+    return complaint_type, department, summary
+
+
+DEFAULT_PREDICTION = ("Other", "General Administration", "Issue reported")
+
+
+def _model_failed(version, count):
+    # A broken artifact would otherwise route every report to the default silently
+    logger.exception("Department model %s failed to predict %d description(s)", version, count)
+    if observer:
+        observer.model_error(version)
+
+
+def _classify(description: str, model, version=None):
     # Rule-based detection for common issues
-    description_lower = description.lower()
-    
-    # Water/Utilities issues
-    if any(word in description_lower for word in ['water', 'leak', 'pipe', 'flooding', 'sewage', 'drain']):
-        return "Water/Utilities", "Utilities Department", "Water or plumbing issue detected"
-    
-    # Traffic issues
-    if any(word in description_lower for word in ['pothole', 'road', 'street light', 'broken light', 'traffic']):
-        return "Traffic/Infrastructure", "Traffic Department", "Road or traffic infrastructure issue"
-    
-    # Garbage/Sanitation
-    if any(word in description_lower for word in ['garbage', 'trash', 'litter', 'waste', 'dirty']):
-        return "Sanitation", "Sanitation Department", "Garbage or waste management issue"
+    started = time.perf_counter()
+    matched = match_rules(description.lower())
+    if observer:
+        observer.stage("rules", time.perf_counter() - started)
+    if matched:
+        if observer:
+            observer.results("rule")
+        return matched
     
     # Use ML model if available
     if model:
         try:
+            started = time.perf_counter()
             complaint_type = model.predict([description])[0]
-            department = map_to_department(complaint_type)
-            summary = f"Complaint classified as {complaint_type}"
-            return complaint_type, department, summary
-        except:
-            pass
+            if observer:
+                observer.stage("model", time.perf_counter() - started)
+                observer.results("ml")
+            return _from_complaint_type(complaint_type)
+        except Exception:
+            _model_failed(version, 1)
     
     # Default
-    return "Other", "General Administration", "Issue reported"
+    if observer:
+        observer.results("default")
+    return DEFAULT_PREDICTION
+
+
+def _classify_batch(descriptions, model, version=None):
+    started = time.perf_counter()
+    results = [match_rules(description.lower()) for description in descriptions]
+    pending = [i for i, matched in enumerate(results) if matched is None]
+    if observer:
+        observer.stage("rules", time.perf_counter() - started)
+        observer.results("rule", len(results) - len(pending))
+
+    if pending and model:
+        try:
+            started = time.perf_counter()
+            complaint_types = model.predict([descriptions[i] for i in pending])
+            for i, complaint_type in zip(pending, complaint_types):
+                results[i] = _from_complaint_type(complaint_type)
+            if observer:
+                observer.stage("model", time.perf_counter() - started)
+                observer.results("ml", len(pending))
+            pending = []
+        except Exception:
+            _model_failed(version, len(pending))
+
+    if observer and pending:
+        observer.results("default", len(pending))
+    return [matched or DEFAULT_PREDICTION for matched in results]
+
+
+def predict_department(description: str, loaded=None):
+    """Predict complaint type and generate AI summary
+
+    Predictions are memoized on the normalized description (case, whitespace
+    and punctuation folded) for the currently loaded model version.
+    """
+    loaded = loaded or active_model()
+    key = normalize_description(description)
+    cached = prediction_cache.get(key, loaded.version)
+    if cached is not None:
+        if observer:
+            observer.results("cache")
+        return cached
+
+    result = _classify(key, loaded.model, loaded.version)
+    prediction_cache.set(key, result, loaded.version)
+    return result
+
+
+def predict_department_batch(descriptions, loaded=None):
+    """Predict complaint type, department and summary for many descriptions at once.
+
+    Keyword rules are applied per row; every row that falls through is sent to
+    the ML model in a single vectorized predict call. Cached and repeated
+    descriptions are only classified once.
+    """
+    loaded = loaded or active_model()
+    keys = [normalize_description(description) for description in descriptions]
+
+    known = {}
+    for key in keys:
+        if key not in known:
+            known[key] = prediction_cache.get(key, loaded.version)
+
+    missing = [key for key, value in known.items() if value is None]
+    if observer:
+        observer.results("cache", len(keys) - len(missing))
+    if missing:
+        for key, result in zip(missing, _classify_batch(missing, loaded.model, loaded.version)):
+            known[key] = result
+            prediction_cache.set(key, result, loaded.version)
 
+    return [known[key] for key in keys]
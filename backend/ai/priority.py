@@ -0,0 +1,59 @@
+import re
+
+# Base urgency (0-100) by complaint category; unlisted categories get DEFAULT_SCORE
+CATEGORY_SCORES = {
+    "Water/Utilities": 55,
+    "Traffic/Infrastructure": 50,
+    "Sanitation": 35,
+    "Animal Abuse": 55,
+    "Blocked Driveway": 40,
+    "Illegal Parking": 25,
+    "Derelict Vehicle": 20,
+    "Disorderly Youth": 35,
+    "Drinking": 30,
+    "Graffiti": 15,
+    "Posting Advertisement": 10,
+    "Vending": 15,
+}
+DEFAULT_SCORE = 30
+
+# Words that signal risk to people or property, with the points they add.
+# Matched as word prefixes, so "injur" covers injured/injury.
+URGENCY_KEYWORDS = {
+    "emergency": 30,
+    "danger": 25,
+    "injur": 30,
+    "fire": 30,
+    "gas": 25,
+    "electr": 20,
+    "collaps": 25,
+    "flood": 20,
+    "sewage": 15,
+    "child": 10,
+    "school": 10,
+    "hospital": 15,
+    "elderly": 10,
+    "urgent": 15,
+    "blocked": 10,
+    "weeks": 10,
+    "days": 5,
+}
+
+# Each earlier near-duplicate report adds this much, up to DUPLICATE_CAP
+DUPLICATE_POINTS = 5
+DUPLICATE_CAP = 20
+
+# Lowest score for each label, highest first
+LEVELS = [(70, "High"), (40, "Medium"), (0, "Low")]
+
+_URGENCY = re.compile(r"\b(" + "|".join(sorted(URGENCY_KEYWORDS, key=len, reverse=True)) + ")")
+
+
+def score_priority(description: str, category: str, duplicates: int = 0):
+    """(label, score) for a classified report; score is 0-100"""
+    score = CATEGORY_SCORES.get(category, DEFAULT_SCORE)
+    score += sum(URGENCY_KEYWORDS[kw] for kw in set(_URGENCY.findall(description.lower())))
+    score += min(duplicates * DUPLICATE_POINTS, DUPLICATE_CAP)
+    score = min(score, 100)
+    label = next(label for threshold, label in LEVELS if score >= threshold)
+    return label, score
@@ -1,63 +1,133 @@
+import math
 import sys
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 # Resolve paths relative to this script
 BASE_DIR = Path(__file__).resolve().parent
 CSV_PATH = BASE_DIR / "dataset.csv"
+OUT_PATH = BASE_DIR / "dataset_small.csv"
 
-if not CSV_PATH.exists():
-	print(f"dataset.csv not found at {CSV_PATH}")
-	sys.exit(1)
-
-# Load large dataset
-df = pd.read_csv(CSV_PATH)
-print("Original size:", len(df))
+# Sampling size (adjustable)
+REQUESTED_N = 20000
+# Same threshold train_model.py applies; rarer classes are dropped
+MIN_SAMPLES = 20
+CHUNK_SIZE = 200_000
+SEED = 42
 
 # Keep only required columns (update if column names differ)
-def _find_column(df, keywords):
-	for col in df.columns:
+def _find_column(columns, keywords):
+	for col in columns:
 		lc = col.lower()
 		for kw in keywords:
 			if kw in lc:
 				return col
 	return None
 
-# auto-detect description and complaint type columns (tolerant to spacing/case)
-desc_col = _find_column(df, ["description", "descriptor", "resolution description", "resolution"])
-comp_col = _find_column(df, ["complaint type", "complaint", "complaint_type"]) or _find_column(df, ["agency name"]) 
-agency_col = _find_column(df, ["agency name", "agency", "agency_name"]) or _find_column(df, ["agency"]) 
 
-if not desc_col or not comp_col:
-	print(f"Could not auto-detect required columns. Found desc={desc_col}, comp={comp_col}")
-	print(f"Available columns: {list(df.columns)}")
-	sys.exit(1)
+def _quotas(counts, total):
+	"""Per-class sample sizes: proportional to class frequency, at least
+	MIN_SAMPLES (so train_model.py keeps the class), never more than available."""
+	share = np.ceil(counts * (REQUESTED_N / max(total, 1)))
+	return np.minimum(np.maximum(share, MIN_SAMPLES), counts).astype("int64")
 
-# include agency_col if available for department classification
-cols = [desc_col, comp_col]
-if agency_col:
-	cols.append(agency_col)
 
-df = df[cols]
-# Normalize column names for downstream processing
-names = ["description", "complaint_type"]
-if agency_col:
-	names.append("agency_name")
-df.columns = names
+def stratified_reservoir(reader, rng):
+	"""Single-pass stratified sample of a chunked CSV reader.
 
-# Drop null values
-df = df.dropna()
+	Every row gets a uniform random key and each class keeps the rows with its
+	smallest keys (bottom-k sampling). Each class holds as many rows as the
+	largest quota it has had so far. That bound only grows, so a class whose
+	share falls keeps its rows, and the final quotas are applied at the end.
+	Memory stays near REQUESTED_N rows, plus the MIN_SAMPLES floors and the
+	slack of classes whose share fell.
 
-# Sampling size (adjustable)
-REQUESTED_N = 20000
-if len(df) < REQUESTED_N:
-	print(f"Dataset has only {len(df)} rows after cleaning; using full dataset instead of sampling {REQUESTED_N} rows.")
-	df_small = df.copy()
-else:
-	df_small = df.sample(n=REQUESTED_N, random_state=42)
+	The sample of a class is exactly uniform unless its final quota is larger
+	than any quota it had before its last rows were discarded. That happens
+	only when its share rises late in the file, e.g. a seasonal complaint type
+	in a date-ordered export. The rows discarded earlier cannot come back, so
+	such a class leans toward its later rows.
+	"""
+	kept = None
+	counts = pd.Series(dtype="int64")
+	caps = pd.Series(dtype="int64")
+	total = 0
+
+	for chunk in reader:
+		chunk = chunk.dropna()
+		if chunk.empty:
+			continue
+		chunk = chunk.assign(_key=rng.random(len(chunk)))
+
+		counts = counts.add(chunk["complaint_type"].value_counts(), fill_value=0).astype("int64")
+		total += len(chunk)
+		quotas = _quotas(counts, total)
+		caps = np.maximum(quotas, caps.reindex(quotas.index, fill_value=0)).astype("int64")
+
+		pool = chunk if kept is None else pd.concat([kept, chunk], ignore_index=True)
+		pool = pool.sort_values(["complaint_type", "_key"], kind="stable")
+		rank = pool.groupby("complaint_type", sort=False).cumcount()
+		kept = pool[rank.to_numpy() < pool["complaint_type"].map(caps).to_numpy()]
+		print(f"Scanned {total} rows, holding {len(kept)}", end="\r")
+	print()
+
+	if kept is None:
+		return None, counts, total
+
+	# Final quotas from the complete class counts; drop classes that are too rare
+	quotas = _quotas(counts, total)
+	kept = kept[kept["complaint_type"].map(counts).to_numpy() >= MIN_SAMPLES]
+	rank = kept.groupby("complaint_type", sort=False).cumcount()
+	kept = kept[rank.to_numpy() < kept["complaint_type"].map(quotas).to_numpy()]
+	return kept.drop(columns="_key"), counts, total
+
+
+def main():
+	if not CSV_PATH.exists():
+		print(f"dataset.csv not found at {CSV_PATH}")
+		sys.exit(1)
+
+	# Only the header is read to detect columns
+	columns = list(pd.read_csv(CSV_PATH, nrows=0).columns)
+
+	# auto-detect description and complaint type columns (tolerant to spacing/case)
+	desc_col = _find_column(columns, ["description", "descriptor", "resolution description", "resolution"])
+	comp_col = _find_column(columns, ["complaint type", "complaint", "complaint_type"]) or _find_column(columns, ["agency name"])
+	agency_col = _find_column(columns, ["agency name", "agency", "agency_name"]) or _find_column(columns, ["agency"])
+
+	if not desc_col or not comp_col:
+		print(f"Could not auto-detect required columns. Found desc={desc_col}, comp={comp_col}")
+		print(f"Available columns: {columns}")
+		sys.exit(1)
+
+	# include agency_col if available for department classification
+	cols = [desc_col, comp_col]
+	names = ["description", "complaint_type"]
+	if agency_col and agency_col not in cols:
+		cols.append(agency_col)
+		names.append("agency_name")
+
+	reader = pd.read_csv(CSV_PATH, usecols=cols, dtype=str, chunksize=CHUNK_SIZE)
+	# Normalize column names for downstream processing
+	reader = (chunk[cols].set_axis(names, axis=1) for chunk in reader)
+
+	df_small, counts, total = stratified_reservoir(reader, np.random.default_rng(SEED))
+	print("Original size (after dropping nulls):", total)
+	if df_small is None:
+		print("No usable rows found.")
+		sys.exit(1)
+
+	dropped = counts[counts < MIN_SAMPLES]
+	if len(dropped):
+		print(f"Dropped {len(dropped)} classes with fewer than {MIN_SAMPLES} rows")
+
+	# Shuffle so the output is not grouped by class
+	df_small = df_small.sample(frac=1, random_state=SEED)
+	df_small.to_csv(OUT_PATH, index=False)
+
+	print("New dataset created with:", len(df_small), "->", OUT_PATH)
 
-# Save smaller dataset next to original
-OUT_PATH = BASE_DIR / "dataset_small.csv"
-df_small.to_csv(OUT_PATH, index=False)
 
-print("New dataset created with:", len(df_small), "->", OUT_PATH)
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,244 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .compact import SUFFIX as COMPACT_SUFFIX, CompactModel
+
+logger = logging.getLogger(__name__)
+
+# "auto" serves the NumPy-only export when one exists and falls back to the
+# pickled sklearn pipeline; "numpy" or "sklearn" force one engine.
+MODEL_ENGINE = os.getenv("MODEL_ENGINE", "auto")
+
+# Descriptions used to warm a freshly loaded model before it takes traffic
+WARMUP_SAMPLES = [
+    "Loud music from the apartment upstairs",
+    "Car blocking my driveway",
+    "Graffiti on the park wall",
+    "Dog left outside without food",
+]
+
+
+class LoadedModel:
+    """An immutable (version, estimator) pair.
+
+    Callers take a reference to the active LoadedModel once per request, so a
+    swap never changes the model under a prediction that is already running.
+    """
+
+    __slots__ = ("version", "model", "path", "engine", "loaded_at")
+
+    def __init__(self, version, model, path=None, engine=None):
+        self.version = version
+        self.model = model
+        self.path = path
+        self.engine = engine
+        self.loaded_at = datetime.utcnow()
+
+
+class ModelRegistry:
+    """Versioned department model artifacts with background hot reload.
+
+    Artifacts live next to the default ``department_model.pkl`` as
+    ``department_model-<version>.pkl``, each optionally accompanied by a
+    NumPy-only ``.npmodel`` export (see ai/compact.py). The default file is
+    versioned by a hash of its contents. The version to serve is recorded in the ``ACTIVE_MODEL``
+    pointer file; every worker watches it and reloads when it changes.
+    """
+
+    def __init__(self, base_dir: Path, default_name="department_model.pkl",
+                 on_swap=None, poll_interval: float = 5.0, engine: str = MODEL_ENGINE):
+        self.base_dir = Path(base_dir)
+        self.default_path = self.base_dir / default_name
+        self.prefix = self.default_path.stem + "-"
+        self.pointer_path = self.base_dir / "ACTIVE_MODEL"
+        self.on_swap = on_swap
+        self.poll_interval = poll_interval
+        self.engine = engine
+
+        self.active = LoadedModel(None, None)
+        self.loading_version = None
+        self.last_error = None
+        self.initialized = False
+        self._initial_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._next_poll = 0.0
+        self._pointer_mtime = None
+
+    # -- artifacts -----------------------------------------------------------
+
+    def available_versions(self):
+        versions = sorted({
+            p.name[len(self.prefix):-len(p.suffix)]
+            for pattern in ("*.pkl", f"*{COMPACT_SUFFIX}")
+            for p in self.base_dir.glob(self.prefix + pattern)
+        })
+        default = self._default_version()
+        if default:
+            versions.insert(0, default)
+        return versions
+
+    def _default_compact(self):
+        return self.default_path.with_suffix(COMPACT_SUFFIX)
+
+    def _default_version(self):
+        if self.default_path.exists():
+            return hashlib.sha256(self.default_path.read_bytes()).hexdigest()[:12]
+        if self._default_compact().exists():
+            return CompactModel(self._default_compact()).source_version
+        return None
+
+    def _artifact_paths(self, version):
+        """(pickle, compact export) for a version; either may be None"""
+        default = self._default_version()
+        if version is None or version == default:
+            if default is None:
+                raise FileNotFoundError(f"No model artifact at {self.default_path}")
+            pickle = self.default_path if self.default_path.exists() else None
+            compact = self._default_compact()
+            # Ignore an export left behind by a previous training run
+            if compact.exists() and CompactModel(compact).source_version != default:
+                logger.warning("Ignoring stale %s (not exported from %s)", compact.name, default)
+                compact = None
+            return default, pickle, compact if compact and compact.exists() else None
+
+        pickle = self.base_dir / f"{self.prefix}{version}.pkl"
+        compact = self.base_dir / f"{self.prefix}{version}{COMPACT_SUFFIX}"
+        pickle, compact = (pickle if pickle.exists() else None), (compact if compact.exists() else None)
+        if pickle is None and compact is None:
+            raise FileNotFoundError(f"No model artifact for version {version!r}")
+        return version, pickle, compact
+
+    def _read_pointer(self):
+        try:
+            return self.pointer_path.read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    # -- loading -------------------------------------------------------------
+
+    def _load(self, version):
+        version, pickle, compact = self._artifact_paths(version)
+
+        if compact is not None and self.engine != "sklearn":
+            path, engine, model = compact, "numpy", CompactModel(compact)
+        elif pickle is not None and self.engine != "numpy":
+            # Imported lazily: unpickling pulls in scikit-learn
+            import joblib
+            path, engine, model = pickle, "sklearn", joblib.load(pickle)
+        else:
+            raise FileNotFoundError(f"No {self.engine} artifact for model version {version!r}")
+
+        # Warm up: fails fast on a broken artifact and pays first-call costs
+        # before the model is visible to requests.
+        model.predict(WARMUP_SAMPLES)
+        return LoadedModel(version, model, path, engine)
+
+    def _swap(self, loaded):
+        self.active = loaded
+        if self.on_swap:
+            self.on_swap(loaded)
+        logger.info("Department model %s is now active", loaded.version)
+
+    def load_initial(self):
+        """Synchronously load the pointed-to version, falling back to the default"""
+        version = self._read_pointer()
+        self._pointer_mtime = self._pointer_stat()
+        try:
+            loaded = self._load(version)
+        except Exception as e:
+            if version is None:
+                self._fail(None, e)
+                loaded = LoadedModel(None, None)
+            else:
+                self._fail(version, e)
+                try:
+                    loaded = self._load(None)
+                except Exception as e:
+                    self._fail(None, e)
+                    loaded = LoadedModel(None, None)
+        self._swap(loaded)
+        self.initialized = True
+        return loaded
+
+    def ensure_loaded(self):
+        """Run load_initial once; concurrent callers wait for the first load"""
+        if not self.initialized:
+            with self._initial_lock:
+                if not self.initialized:
+                    self.load_initial()
+        return self.active
+
+    def warm_up(self):
+        """Start the initial load in a background thread"""
+        threading.Thread(target=self.ensure_loaded, name="model-warm-up", daemon=True).start()
+
+    def _fail(self, version, error):
+        self.last_error = f"{version or 'default'}: {error!r}"
+        logger.error("Could not load department model %s: %r", version or "default", error)
+
+    def reload(self, version=None, persist=True):
+        """Load a version in a background thread and swap it in once warm.
+
+        Returns False if another reload is already running.
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+
+        def run():
+            try:
+                self.loading_version = version or "default"
+                loaded = self._load(version)
+                if persist:
+                    self.pointer_path.write_text(loaded.version)
+                    self._pointer_mtime = self._pointer_stat()
+                self.last_error = None
+                self._swap(loaded)
+            except Exception as e:
+                self._fail(version, e)
+            finally:
+                self.loading_version = None
+                self._reload_lock.release()
+
+        threading.Thread(target=run, name="model-reload", daemon=True).start()
+        return True
+
+    # -- file watch ----------------------------------------------------------
+
+    def _pointer_stat(self):
+        try:
+            return self.pointer_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def poll(self):
+        """Cheap, throttled check of the pointer file; reloads when it changes"""
+        now = time.monotonic()
+        if now < self._next_poll:
+            return
+        self._next_poll = now + self.poll_interval
+
+        mtime = self._pointer_stat()
+        if mtime == self._pointer_mtime:
+            return
+        self._pointer_mtime = mtime
+        version = self._read_pointer()
+        if version and version != self.active.version:
+            self.reload(version, persist=False)
+
+    def status(self) -> dict:
+        active = self.active
+        return {
+            "active_version": active.version,
+            "active_path": str(active.path) if active.path else None,
+            "engine": active.engine,
+            "loaded_at": active.loaded_at.isoformat() if active.model else None,
+            "initialized": self.initialized,
+            "loading_version": self.loading_version,
+            "last_error": self.last_error,
+            "available_versions": self.available_versions(),
+        }
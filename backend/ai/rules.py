@@ -0,0 +1,91 @@
+import re
+
+# Keyword rules, in priority order: when a description matches keywords from
+# several categories, the first category listed here wins.
+RULES = [
+    {
+        "category": "Water/Utilities",
+        "department": "Utilities Department",
+        "summary": "Water or plumbing issue detected",
+        "keywords": ["water", "leak", "pipe", "flooding", "sewage", "drain"],
+    },
+    {
+        "category": "Traffic/Infrastructure",
+        "department": "Traffic Department",
+        "summary": "Road or traffic infrastructure issue",
+        "keywords": ["pothole", "road", "street light", "broken light", "traffic"],
+    },
+    {
+        "category": "Sanitation",
+        "department": "Sanitation Department",
+        "summary": "Garbage or waste management issue",
+        "keywords": ["garbage", "trash", "litter", "waste", "dirty"],
+    },
+]
+
+
+def _trie_pattern(words):
+    """Build a prefix-factored regex from a list of words.
+
+    Shared prefixes are matched once, so the cost of trying a position no longer
+    grows with the number of keywords. Optional suffixes are greedy, which makes
+    the pattern return the longest keyword starting at a given position.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        end = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            body = body + "?" if len(branches) == 1 and len(branches[0]) == 1 else "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+def compile_rules(rules):
+    """Compile a rule table into a single-pass matcher.
+
+    Every keyword goes into one trie regex wrapped in a lookahead, so each
+    position of the description is tried once without consuming text. That
+    keeps the plain substring semantics of the old ``any(word in text ...)``
+    checks, including overlapping keywords.
+    """
+    results = [(r["category"], r["department"], r["summary"]) for r in rules]
+
+    priority = {}
+    for index, r in enumerate(rules):
+        for kw in r["keywords"]:
+            priority.setdefault(kw.lower(), index)
+
+    # The regex reports the longest keyword at each position; every keyword that
+    # is a prefix of it matched there too, so fold their priorities in.
+    effective = {
+        kw: min(priority[kw[:i]] for i in range(1, len(kw) + 1) if kw[:i] in priority)
+        for kw in priority
+    }
+
+    pattern = re.compile("(?=(" + _trie_pattern(effective) + "))")
+
+    def match(description_lower: str):
+        best = None
+        for m in pattern.finditer(description_lower):
+            index = effective[m.group(1)]
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return results[best] if best is not None else None
+
+    return match
+
+
+match_rules = compile_rules(RULES)
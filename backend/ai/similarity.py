@@ -0,0 +1,104 @@
+"""MinHash / LSH index for near-duplicate report descriptions.
+
+Descriptions are normalized, split into character shingles and reduced to a
+fixed-size MinHash signature. Signatures are cut into bands; two descriptions
+become candidates when any band matches exactly, so a lookup costs a few dict
+probes regardless of how many reports are indexed. Candidates are confirmed
+with the signature-estimated Jaccard similarity.
+"""
+import threading
+import zlib
+
+import numpy as np
+
+from .cache import normalize_description
+
+_PRIME = np.uint64((1 << 61) - 1)
+
+
+class MinHashLSH:
+    def __init__(self, num_perm=64, bands=16, threshold=0.7, shingle_size=4,
+                 capacity=50000, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.capacity = capacity
+
+        rng = np.random.default_rng(seed)
+        # a*x + b mod p with 32-bit shingle hashes and 32-bit a, b cannot overflow uint64
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        # Insertion-ordered: a re-added id moves to the end, the first is the oldest
+        self._signatures = {}
+        self._buckets = [{} for _ in range(bands)]
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, item_id):
+        return item_id in self._signatures
+
+    def signature(self, text: str):
+        text = normalize_description(text)
+        k = self.shingle_size
+        shingles = {text[i:i + k] for i in range(max(len(text) - k + 1, 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles)
+        )
+        return ((np.outer(hashes, self._a) + self._b) % _PRIME).min(axis=0)
+
+    def _band_keys(self, signature):
+        r = self.rows
+        return [signature[i * r:(i + 1) * r].tobytes() for i in range(self.bands)]
+
+    def query(self, signature, exclude=None, limit=20, before=None):
+        """Most recent ids whose estimated Jaccard similarity >= threshold.
+
+        ``before`` keeps only ids smaller than it (items added earlier).
+        """
+        with self._lock:
+            candidates = set()
+            for bucket, key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(bucket.get(key, ()))
+            candidates.discard(exclude)
+            if before is not None:
+                candidates = {i for i in candidates if i < before}
+            if not candidates:
+                return []
+            ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            stacked = np.stack([self._signatures[i] for i in ids.tolist()])
+        similarity = (stacked == signature).mean(axis=1)
+        matches = np.sort(ids[similarity >= self.threshold])[::-1]
+        return matches[:limit].tolist()
+
+    def add(self, item_id, signature):
+        with self._lock:
+            if item_id in self._signatures:
+                self._remove(item_id)
+            self._signatures[item_id] = signature
+            for bucket, key in zip(self._buckets, self._band_keys(signature)):
+                bucket.setdefault(key, set()).add(item_id)
+            # Only the most recent `capacity` items are kept
+            while len(self._signatures) > self.capacity:
+                self._remove(next(iter(self._signatures)))
+
+    def _remove(self, item_id):
+        signature = self._signatures.pop(item_id)
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            ids = bucket.get(key)
+            if ids is not None:
+                ids.discard(item_id)
+                if not ids:
+                    del bucket[key]
+
+    def clear(self):
+        with self._lock:
+            self._signatures.clear()
+            for bucket in self._buckets:
+                bucket.clear()
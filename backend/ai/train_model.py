@@ -1,61 +1,232 @@
+import argparse
+import hashlib
+import shutil
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import scipy.sparse as sp
+from joblib import Parallel, delayed
 from sklearn.pipeline import make_pipeline
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report
+from sklearn.metrics import accuracy_score, classification_report
 import joblib
 
+try:
+    from ai.compact import SUFFIX as COMPACT_SUFFIX, export_pipeline
+except ImportError:  # run as a script from inside ai/
+    from compact import SUFFIX as COMPACT_SUFFIX, export_pipeline
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 BASE_DIR = Path(__file__).resolve().parent
 CSV_PATH = BASE_DIR / "dataset.csv"
 OUT_MODEL = BASE_DIR / "department_model.pkl"
-
-if not CSV_PATH.exists():
-    print(f"dataset.csv not found at {CSV_PATH}")
-    sys.exit(1)
-
-df = pd.read_csv(CSV_PATH)
-
-
-if "description" not in df.columns or "complaint_type" not in df.columns:
-    print("Required columns not found.")
-    print("Available columns:", list(df.columns))
-    sys.exit(1)
-
-
-df = df[["description", "complaint_type"]].dropna()
-df.columns = ["description", "department"]
-
-
-min_samples = 20
-counts = df["department"].value_counts()
-df = df[df["department"].isin(counts[counts >= min_samples].index)]
-
-# TRAIN / TEST SPLIT
-X = df["description"].astype(str)
-y = df["department"].astype(str)
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
-
-pipe = make_pipeline(
-    TfidfVectorizer(max_features=20000, ngram_range=(1, 2)),
-    LogisticRegression(max_iter=1000)
-)
-
-print("Training department classifier on", len(X_train), "samples")
-pipe.fit(X_train, y_train)
-
-acc = pipe.score(X_test, y_test)
-print(f"\nValidation accuracy: {acc:.4f}")
-
-y_pred = pipe.predict(X_test)
-
-print("\nClassification Report:\n")
-print(classification_report(y_test, y_pred))
-
-joblib.dump(pipe, OUT_MODEL)
-print("\nSaved department model to", OUT_MODEL)
+# Versioned copy for the model registry (see ai/registry.py)
+VERSION = datetime.now().strftime("%Y%m%d%H%M%S")
+OUT_VERSIONED = BASE_DIR / f"department_model-{VERSION}.pkl"
+
+MIN_SAMPLES = 20
+TEXT_COL, LABEL_COL = "description", "complaint_type"
+
+
+def _check_columns(csv_path):
+    columns = pd.read_csv(csv_path, nrows=0).columns
+    if TEXT_COL not in columns or LABEL_COL not in columns:
+        print("Required columns not found.")
+        print("Available columns:", list(columns))
+        sys.exit(1)
+
+
+def train_in_memory(csv_path):
+    """TF-IDF + LogisticRegression on the whole dataset (the default mode)"""
+    df = pd.read_csv(csv_path)
+
+    df = df[[TEXT_COL, LABEL_COL]].dropna()
+    df.columns = ["description", "department"]
+
+    counts = df["department"].value_counts()
+    df = df[df["department"].isin(counts[counts >= MIN_SAMPLES].index)]
+
+    # TRAIN / TEST SPLIT
+    X = df["description"].astype(str)
+    y = df["department"].astype(str)
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+
+    pipe = make_pipeline(
+        TfidfVectorizer(max_features=20000, ngram_range=(1, 2)),
+        LogisticRegression(max_iter=1000)
+    )
+
+    print("Training department classifier on", len(X_train), "samples")
+    pipe.fit(X_train, y_train)
+
+    acc = pipe.score(X_test, y_test)
+    print(f"\nValidation accuracy: {acc:.4f}")
+
+    y_pred = pipe.predict(X_test)
+
+    print("\nClassification Report:\n")
+    print(classification_report(y_test, y_pred))
+    return pipe
+
+
+def _peak_memory_mb():
+    """Peak RSS of this process and of finished worker processes, in MB"""
+    if resource is None:
+        return None, None
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024  # bytes on macOS, KB on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return own, children
+
+
+def _count_labels(csv_path, chunksize):
+    """First pass: class counts, reading only the two training columns"""
+    counts = pd.Series(dtype="int64")
+    for chunk in pd.read_csv(csv_path, usecols=[TEXT_COL, LABEL_COL], chunksize=chunksize):
+        chunk = chunk.dropna()
+        counts = counts.add(chunk[LABEL_COL].astype(str).value_counts(), fill_value=0)
+    return counts
+
+
+def _hash_parallel(vectorizer, texts, parallel, n_jobs):
+    """Hash a chunk of texts, split across workers; HashingVectorizer is stateless"""
+    if n_jobs == 1 or len(texts) < 2000:
+        return vectorizer.transform(texts)
+    parts = np.array_split(np.asarray(texts, dtype=object), n_jobs)
+    return sp.vstack(parallel(delayed(vectorizer.transform)(p) for p in parts if len(p)))
+
+
+def train_streaming(csv_path, chunksize, n_features, epochs, n_jobs, test_every=5, max_test=50000):
+    """Out-of-core training: chunked CSV reads, hashing features, partial_fit.
+
+    Memory is bounded by the chunk size and the hashed feature space, not by the
+    dataset size. Every ``test_every``-th usable row (up to ``max_test``) is held
+    out for validation.
+    """
+    started = time.perf_counter()
+    counts = _count_labels(csv_path, chunksize)
+    classes = np.array(sorted(counts[counts >= MIN_SAMPLES].index))
+    keep = set(classes)
+    print(f"Label pass: {int(counts.sum())} rows, {len(classes)} classes with >= {MIN_SAMPLES} samples")
+
+    vectorizer = HashingVectorizer(
+        n_features=n_features, ngram_range=(1, 2), alternate_sign=False, norm="l2"
+    )
+    clf = SGDClassifier(loss="log_loss", alpha=1e-6, n_jobs=n_jobs, random_state=42)
+
+    X_test, y_test = [], []
+    trained = 0
+    with Parallel(n_jobs=n_jobs) as parallel:
+        for epoch in range(epochs):
+            row = 0
+            for chunk in pd.read_csv(csv_path, usecols=[TEXT_COL, LABEL_COL], chunksize=chunksize):
+                chunk = chunk.dropna()
+                labels = chunk[LABEL_COL].astype(str)
+                chunk = chunk[labels.isin(keep)]
+                texts = chunk[TEXT_COL].astype(str).to_numpy()
+                labels = labels[labels.isin(keep)].to_numpy()
+
+                held_out = (np.arange(row, row + len(texts)) % test_every) == 0
+                row += len(texts)
+                if epoch == 0 and len(X_test) < max_test:
+                    take = np.flatnonzero(held_out)[:max_test - len(X_test)]
+                    X_test.extend(texts[take])
+                    y_test.extend(labels[take])
+
+                texts, labels = texts[~held_out], labels[~held_out]
+                if not len(texts):
+                    continue
+                X = _hash_parallel(vectorizer, texts, parallel, n_jobs)
+                clf.partial_fit(X, labels, classes=classes)
+                trained += len(texts)
+
+                elapsed = time.perf_counter() - started
+                print(f"  epoch {epoch + 1}: {trained} rows trained, {trained / elapsed:,.0f} rows/s", end="\r")
+    print()
+
+    elapsed = time.perf_counter() - started
+    own, children = _peak_memory_mb()
+    print(f"Trained on {trained} rows in {elapsed:.1f}s ({trained / elapsed:,.0f} rows/s)")
+    if own is not None:
+        print(f"Peak memory: {own:.0f} MB (main process), {children:.0f} MB (largest worker)")
+
+    # Hashed buckets never seen in training keep a zero weight; storing coef_
+    # as a sparse matrix keeps the artifact proportional to the real vocabulary.
+    clf.sparsify()
+
+    pipe = make_pipeline(vectorizer, clf)
+    if X_test:
+        y_pred = pipe.predict(X_test)
+        print(f"\nValidation accuracy: {accuracy_score(y_test, y_pred):.4f}")
+        print("\nClassification Report:\n")
+        print(classification_report(y_test, y_pred, zero_division=0))
+    return pipe
+
+
+def export_compact(pipe, pickle_path, version):
+    """Write the NumPy-only export next to a pickle (TF-IDF pipelines only)"""
+    out_dir = pickle_path.with_suffix(COMPACT_SUFFIX)
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    if not isinstance(pipe[0], TfidfVectorizer):
+        print("Skipping NumPy export: only TF-IDF pipelines are supported")
+        return None
+    export_pipeline(pipe, out_dir, source_version=version)
+    print("Exported NumPy inference model to", out_dir)
+    return out_dir
+
+
+def save(pipe):
+    joblib.dump(pipe, OUT_MODEL)
+    joblib.dump(pipe, OUT_VERSIONED)
+    print("\nSaved department model to", OUT_MODEL)
+    print("Saved versioned artifact", VERSION, "to", OUT_VERSIONED)
+    export_compact(pipe, OUT_MODEL, hashlib.sha256(OUT_MODEL.read_bytes()).hexdigest()[:12])
+    export_compact(pipe, OUT_VERSIONED, VERSION)
+    print("Activate it with POST /admin/model/reload?version=" + VERSION)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the department classifier")
+    parser.add_argument("--csv", type=Path, default=CSV_PATH, help="training CSV with description,complaint_type")
+    parser.add_argument("--streaming", action="store_true",
+                        help="out-of-core mode for datasets that do not fit in memory")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows per chunk (streaming)")
+    parser.add_argument("--n-features", type=int, default=2 ** 20, help="hashed feature space (streaming)")
+    parser.add_argument("--epochs", type=int, default=1, help="passes over the CSV (streaming)")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="worker processes/threads (streaming)")
+    parser.add_argument("--export-only", action="store_true",
+                        help="only write the NumPy export of the existing department_model.pkl")
+    args = parser.parse_args()
+
+    if args.export_only:
+        export_compact(joblib.load(OUT_MODEL), OUT_MODEL, hashlib.sha256(OUT_MODEL.read_bytes()).hexdigest()[:12])
+        return
+
+    if not args.csv.exists():
+        print(f"{args.csv.name} not found at {args.csv}")
+        sys.exit(1)
+    _check_columns(args.csv)
+
+    if args.streaming:
+        n_jobs = joblib.cpu_count() if args.n_jobs < 1 else args.n_jobs
+        pipe = train_streaming(args.csv, args.chunksize, args.n_features, args.epochs, n_jobs)
+    else:
+        pipe = train_in_memory(args.csv)
+    save(pipe)
+
+
+if __name__ == "__main__":
+    main()
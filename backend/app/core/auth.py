@@ -1,8 +1,13 @@
+import os
+import threading
+import time
 from datetime import datetime, timedelta
 from jose import jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
+from sqlalchemy import event
 from sqlalchemy.orm import Session
+from app.core.metrics import PASSWORD_HASH_LATENCY
 from app.db.database import get_db
 from app.models.user import User
 from fastapi import Header
@@ -11,6 +16,10 @@ from fastapi.security import OAuth2PasswordBearer
 SECRET_KEY = "change_this_in_production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# How long a resolved user may be served from memory. Invalidation is
+# per-process, so this also bounds staleness on other workers.
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
 
 pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
 
@@ -18,7 +27,62 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
 
 def verify_password(plain_password, hashed_password):
     """Verify password against hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    with PASSWORD_HASH_LATENCY.time("verify"):
+        return pwd_context.verify(plain_password, hashed_password)
+
+class Principal:
+    """Detached snapshot of the fields request handlers need from a User"""
+
+    __slots__ = ("id", "email", "name", "role", "department")
+
+    def __init__(self, user: User):
+        self.id = user.id
+        self.email = user.email
+        self.name = user.name
+        self.role = user.role
+        self.department = user.department
+
+
+class PrincipalCache:
+    """In-process TTL cache of resolved principals, keyed by user id"""
+
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None or entry[1] < time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def set(self, principal: Principal):
+        with self._lock:
+            if len(self._data) >= self.maxsize:
+                self._data.clear()
+            self._data[principal.id] = (principal, time.monotonic() + self.ttl)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._data.pop(user_id, None)
+
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL, PRINCIPAL_CACHE_SIZE)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    # Any change to a user row (role, password, reset token) drops its cached principal
+    principal_cache.invalidate(target.id)
+
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -35,13 +99,26 @@ def get_current_user(
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
+        user_id = payload.get("uid")
         if email is None:
             raise HTTPException(status_code=401, detail="Invalid token")
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+    # The cache, not the token's role claim, is authoritative: it is refreshed
+    # from the database on expiry and whenever the user row changes.
+    if user_id is not None:
+        principal = principal_cache.get(user_id)
+        if principal is not None and principal.email == email:
+            return principal
+        user = db.get(User, user_id)
+    else:
+        # Tokens issued before the uid claim existed
+        user = db.query(User).filter(User.email == email).first()
+
+    if user is None or user.email != email:
         raise HTTPException(status_code=401, detail="User not found")
 
-    return user
+    principal = Principal(user)
+    principal_cache.set(principal)
+    return principal
@@ -0,0 +1,84 @@
+import logging
+import os
+import threading
+
+from sqlalchemy import select
+
+from ai.similarity import MinHashLSH
+from app.db.database import SessionLocal
+from app.models.report import Report
+
+logger = logging.getLogger(__name__)
+
+# Estimated Jaccard similarity (character 4-shingles) above which a report is
+# flagged as a near-duplicate of an earlier one
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.7"))
+# Number of most recent reports kept in the in-memory index
+DUPLICATE_INDEX_SIZE = int(os.getenv("DUPLICATE_INDEX_SIZE", "50000"))
+
+duplicate_index = MinHashLSH(threshold=DUPLICATE_THRESHOLD, capacity=DUPLICATE_INDEX_SIZE)
+
+_sync_lock = threading.Lock()
+# Highest report id indexed by sync(); reports are indexed in id order
+_last_id = 0
+
+
+def check_and_add_many(items):
+    """Flag (id, description) pairs against earlier reports and index them.
+
+    A report is only compared with smaller ids, so it never matches itself
+    (it may already be indexed by sync() or by an earlier, failed attempt)
+    and two near-duplicates flag only the later one. Items are indexed in
+    order, which also catches duplicates inside the same batch. Returns
+    {id: [duplicate ids]} for flagged items.
+    """
+    flagged = {}
+    for item_id, description in items:
+        signature = duplicate_index.signature(description)
+        if item_id not in duplicate_index:
+            duplicate_index.add(item_id, signature)
+        matches = duplicate_index.query(signature, before=item_id)
+        if matches:
+            flagged[item_id] = matches
+    return flagged
+
+
+def sync(db, batch_size=1000):
+    """Index reports created since the last sync, by this or any other process.
+
+    The first call starts from the most recent DUPLICATE_INDEX_SIZE reports.
+    """
+    global _last_id
+    with _sync_lock:
+        if _last_id == 0:
+            _last_id = db.execute(
+                select(Report.id).order_by(Report.id.desc()).offset(DUPLICATE_INDEX_SIZE).limit(1)
+            ).scalar() or 0
+        indexed = 0
+        while True:
+            rows = db.execute(
+                select(Report.id, Report.description)
+                .where(Report.id > _last_id)
+                .order_by(Report.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            # Oldest first, so eviction order matches insertion order
+            for report_id, description in rows:
+                if report_id not in duplicate_index:
+                    duplicate_index.add(report_id, duplicate_index.signature(description))
+            indexed += len(rows)
+            _last_id = rows[-1].id
+    return indexed
+
+
+def rebuild_in_background():
+    def run():
+        try:
+            with SessionLocal() as db:
+                logger.info("Duplicate index loaded with %d reports", sync(db))
+        except Exception:
+            logger.exception("Could not build the duplicate index")
+
+    threading.Thread(target=run, name="duplicate-index", daemon=True).start()
@@ -0,0 +1,234 @@
+"""Background AI enrichment of new reports.
+
+Report creation only inserts the report and an EnrichmentJob row in one
+transaction, then wakes the worker. The worker runs in a thread of each API
+process. It claims pending jobs in micro-batches and classifies the whole
+batch with one vectorized model call. For each report it then flags
+near-duplicates, scores priority and stores the results. Claims are a single
+UPDATE ... RETURNING (with SKIP LOCKED on PostgreSQL), so several processes can
+share the queue. Claims older than ENRICHMENT_LOCK_TIMEOUT, left behind by a
+crashed process, are picked up again.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, delete, func, or_, select, update
+
+from ai.predict import active_model, predict_department_batch
+from ai.priority import score_priority
+from app.core import duplicates
+from app.core.metrics import ENRICHMENT_BATCH_LATENCY, ENRICHMENT_JOBS, ENRICHMENT_LAG
+from app.db import report_stats, report_versions, search
+from app.db.database import SessionLocal
+from app.models.enrichment_job import EnrichmentJob
+from app.models.report import Report
+
+logger = logging.getLogger(__name__)
+
+# Most reports classified per model call
+ENRICHMENT_BATCH_SIZE = int(os.getenv("ENRICHMENT_BATCH_SIZE", "64"))
+# After a wake-up, wait this long so a burst of reports lands in one batch
+ENRICHMENT_BATCH_WAIT = float(os.getenv("ENRICHMENT_BATCH_WAIT", "0.05"))
+# Idle polling interval; picks up jobs queued by other processes and retries
+ENRICHMENT_POLL_INTERVAL = float(os.getenv("ENRICHMENT_POLL_INTERVAL", "2"))
+ENRICHMENT_LOCK_TIMEOUT = float(os.getenv("ENRICHMENT_LOCK_TIMEOUT", "120"))
+ENRICHMENT_MAX_ATTEMPTS = int(os.getenv("ENRICHMENT_MAX_ATTEMPTS", "3"))
+
+
+def claim_jobs(db, limit):
+    """Mark up to ``limit`` jobs as running and return (job id, report id, created_at) rows"""
+    now = datetime.utcnow()
+    claimable = (
+        select(EnrichmentJob.id)
+        .where(or_(
+            EnrichmentJob.status == "pending",
+            and_(
+                EnrichmentJob.status == "running",
+                EnrichmentJob.locked_at < now - timedelta(seconds=ENRICHMENT_LOCK_TIMEOUT),
+            ),
+        ))
+        .order_by(EnrichmentJob.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    rows = db.execute(
+        update(EnrichmentJob)
+        .where(EnrichmentJob.id.in_(claimable))
+        .values(status="running", locked_at=now, attempts=EnrichmentJob.attempts + 1)
+        .returning(EnrichmentJob.id, EnrichmentJob.report_id, EnrichmentJob.created_at)
+    ).all()
+    db.commit()
+    return rows
+
+
+def enrich(db, report_ids):
+    """Classify, flag and score the given reports and return them"""
+    # Locked so a concurrent status change cannot race the stats bucket move
+    reports = db.execute(
+        select(Report).where(Report.id.in_(report_ids)).order_by(Report.id).with_for_update()
+    ).scalars().all()
+    if not reports:
+        return []
+
+    loaded = active_model()
+    predictions = predict_department_batch([r.description for r in reports], loaded)
+    # Catch up with reports created through other processes first, so
+    # duplicates enriched by different workers are still matched
+    duplicates.sync(db)
+    # In id order, so duplicates within the batch are caught too
+    flagged = duplicates.check_and_add_many([(r.id, r.description) for r in reports])
+
+    moves = []
+    for report, (complaint_type, department, ai_summary) in zip(reports, predictions):
+        old = report_stats.bucket(report.status, report.department, report.category)
+        matches = flagged.get(report.id)
+
+        report.category = complaint_type
+        report.department = department
+        report.ai_summary = ai_summary
+        report.model_version = loaded.version
+        report.suspicious_flag = bool(matches)
+        report.duplicate_of = matches
+        report.priority, report.priority_score = score_priority(
+            report.description, complaint_type, len(matches or ())
+        )
+        report.enrichment_state = "done"
+        moves.append((old, report_stats.bucket(report.status, department, complaint_type)))
+
+    stmt = report_stats.stats_upsert(db.bind.dialect.name, report_stats.moved_deltas(moves))
+    if stmt is not None:
+        db.execute(stmt)
+    db.execute(report_versions.bump(db.bind.dialect.name, [r.user_id for r in reports]))
+    return reports
+
+
+def _fail_jobs(db, jobs, error):
+    job_ids = [job.id for job in jobs]
+    db.execute(
+        update(EnrichmentJob)
+        .where(EnrichmentJob.id.in_(job_ids), EnrichmentJob.attempts < ENRICHMENT_MAX_ATTEMPTS)
+        .values(status="pending", locked_at=None, last_error=error)
+    )
+    failed = db.execute(
+        update(EnrichmentJob)
+        .where(EnrichmentJob.id.in_(job_ids), EnrichmentJob.attempts >= ENRICHMENT_MAX_ATTEMPTS)
+        .values(status="failed", last_error=error)
+        .returning(EnrichmentJob.report_id)
+    ).scalars().all()
+    if failed:
+        owners = db.execute(
+            update(Report).where(Report.id.in_(failed)).values(enrichment_state="failed").returning(Report.user_id)
+        ).scalars().all()
+        db.execute(report_versions.bump(db.bind.dialect.name, owners))
+    db.commit()
+    ENRICHMENT_JOBS.inc("retry", amount=len(jobs) - len(failed))
+    ENRICHMENT_JOBS.inc("failed", amount=len(failed))
+
+
+def process_batch(limit=ENRICHMENT_BATCH_SIZE):
+    """Claim and enrich one micro-batch; returns the number of jobs claimed"""
+    with SessionLocal() as db:
+        jobs = claim_jobs(db, limit)
+        if not jobs:
+            return 0
+
+        started = time.perf_counter()
+        try:
+            reports = enrich(db, [job.report_id for job in jobs])
+            # Plain values: the commit expires the ORM objects, and reading them
+            # afterwards would cost a refresh SELECT per row
+            indexed = [(r.id, r.title, r.description, r.ai_summary) for r in reports]
+            created = [job.created_at for job in jobs]
+            db.execute(delete(EnrichmentJob).where(EnrichmentJob.id.in_([job.id for job in jobs])))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.exception("Enrichment of %d reports failed", len(jobs))
+            _fail_jobs(db, jobs, repr(e)[:500])
+            return len(jobs)
+
+        finished = datetime.utcnow()
+        ENRICHMENT_BATCH_LATENCY.observe(time.perf_counter() - started)
+        ENRICHMENT_JOBS.inc("done", amount=len(jobs))
+        for created_at in created:
+            ENRICHMENT_LAG.observe((finished - created_at).total_seconds())
+        for report_id, title, description, ai_summary in indexed:
+            search.fallback_index.update(report_id, {
+                "title": title, "description": description, "ai_summary": ai_summary,
+            })
+        return len(jobs)
+
+
+def queue_depth(db) -> dict:
+    rows = db.execute(select(EnrichmentJob.status, func.count()).group_by(EnrichmentJob.status)).all()
+    return {status: count for status, count in rows}
+
+
+class EnrichmentWorker:
+    """Thread that drains the enrichment queue in micro-batches"""
+
+    def __init__(self, batch_size=ENRICHMENT_BATCH_SIZE, batch_wait=ENRICHMENT_BATCH_WAIT,
+                 poll_interval=ENRICHMENT_POLL_INTERVAL):
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.batches = 0
+        self.processed = 0
+        self.last_error = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="enrichment", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def notify(self):
+        """Called after committing new jobs; safe from any thread"""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._wake.wait(self.poll_interval):
+                # Let the rest of a burst arrive so it shares one model call
+                time.sleep(self.batch_wait)
+            self._wake.clear()
+            try:
+                # A full batch means more jobs are probably waiting
+                while not self._stop.is_set():
+                    claimed = process_batch(self.batch_size)
+                    if claimed:
+                        self.batches += 1
+                        self.processed += claimed
+                    if claimed < self.batch_size:
+                        break
+            except Exception as e:
+                # e.g. the database is down or not migrated yet; retry on the next poll
+                self.last_error = repr(e)
+                logger.warning("Enrichment worker: %r", e)
+
+    def stats(self) -> dict:
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "batch_size": self.batch_size,
+            "batches": self.batches,
+            "processed": self.processed,
+            "avg_batch_size": self.processed / self.batches if self.batches else 0.0,
+            "last_error": self.last_error,
+        }
+
+
+worker = EnrichmentWorker()
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from fastapi import HTTPException, status
+
+# Dedicated pool for CPU-heavy work (argon2, model inference), separate from
+# Starlette's shared threadpool so a login burst cannot starve cheap endpoints.
+# argon2-cffi and numpy release the GIL, so threads give real parallelism.
+CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", str(os.cpu_count() or 2)))
+# Jobs allowed to wait for a worker before new ones are rejected with 503
+CPU_POOL_MAX_QUEUE = int(os.getenv("CPU_POOL_MAX_QUEUE", "64"))
+
+
+class CPUPool:
+    """Bounded executor with queue-depth metrics"""
+
+    def __init__(self, workers: int, max_queue: int, name: str = "cpu"):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.max_queued_seen = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+
+    def _call(self, fn, submitted_at):
+        started = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.total_wait += started - submitted_at
+        ok = False
+        try:
+            result = fn()
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.total_run += time.perf_counter() - started
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    async def run(self, fn, *args, **kwargs):
+        """Run fn on the pool; raise 503 when the queue is full"""
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server busy, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self.queued += 1
+            self.max_queued_seen = max(self.max_queued_seen, self.queued)
+
+        loop = asyncio.get_running_loop()
+        job = partial(self._call, partial(fn, *args, **kwargs), time.perf_counter())
+        return await loop.run_in_executor(self._executor, job)
+
+    def stats(self) -> dict:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queued": self.queued,
+                "running": self.running,
+                "max_queued_seen": self.max_queued_seen,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_wait_ms": self.total_wait / finished * 1000 if finished else 0.0,
+                "avg_run_ms": self.total_run / finished * 1000 if finished else 0.0,
+            }
+
+
+cpu_pool = CPUPool(CPU_POOL_WORKERS, CPU_POOL_MAX_QUEUE)
@@ -0,0 +1,122 @@
+"""Geohash grid cells for spatial report queries.
+
+Each located report stores the geohash of its position at GEOHASH_PRECISION
+in an indexed column. Every cell at a coarser precision is a prefix of it, so
+it covers one contiguous range of that column (see prefix_range). A radius or bounding-box query is answered by covering the box
+with a few coarse cells, turning each into an index range scan, and then
+applying an exact filter to the few rows those ranges return.
+"""
+import math
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {ch: i for i, ch in enumerate(_BASE32)}
+
+# 7 characters is about 150 m x 150 m at the equator
+GEOHASH_PRECISION = 7
+# Upper bound on ranges OR-ed into one query
+MAX_COVER_CELLS = 16
+METERS_PER_DEGREE = 111_320.0
+
+
+def encode(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # geohash bits alternate lon, lat, lon, ...
+    while len(chars) < precision:
+        interval, x = (lon_range, lon) if even else (lat_range, lat)
+        mid = (interval[0] + interval[1]) / 2
+        if x >= mid:
+            value = value * 2 + 1
+            interval[0] = mid
+        else:
+            value *= 2
+            interval[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int):
+    """(lat degrees, lon degrees) spanned by one cell"""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def decode_center(cell: str):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for ch in cell:
+        value = _DECODE[ch]
+        for shift in range(4, -1, -1):
+            interval = lon_range if even else lat_range
+            mid = (interval[0] + interval[1]) / 2
+            if value >> shift & 1:
+                interval[0] = mid
+            else:
+                interval[1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+def bounding_box(lat: float, lon: float, radius_m: float):
+    """(min_lat, min_lon, max_lat, max_lon) enclosing a circle"""
+    dlat = radius_m / METERS_PER_DEGREE
+    dlon = radius_m / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+    return max(lat - dlat, -90.0), max(lon - dlon, -180.0), min(lat + dlat, 90.0), min(lon + dlon, 180.0)
+
+
+def cover(min_lat, min_lon, max_lat, max_lon, max_cells=MAX_COVER_CELLS):
+    """The finest set of at most ``max_cells`` geohash prefixes covering a box"""
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_step, lon_step = cell_size(precision)
+        rows = math.floor(max_lat / lat_step) - math.floor(min_lat / lat_step) + 1
+        cols = math.floor(max_lon / lon_step) - math.floor(min_lon / lon_step) + 1
+        if rows * cols <= max_cells:
+            break
+    else:
+        return [""]  # the box spans most of the globe
+
+    cells = set()
+    for i in range(rows):
+        lat = min(min_lat + i * lat_step, max_lat)
+        for j in range(cols):
+            cells.add(encode(lat, min(min_lon + j * lon_step, max_lon), precision))
+    # Samples step exactly one cell; the corners guard against float rounding
+    for lat in (min_lat, max_lat):
+        for lon in (min_lon, max_lon):
+            cells.add(encode(lat, lon, precision))
+    return sorted(cells)
+
+
+def prefix_range(prefix: str):
+    """[low, high) bounds of every full-precision geohash starting with ``prefix``.
+
+    The upper bound is the next prefix in base32 order rather than a sentinel
+    character, so it holds under any collation that orders [0-9a-z] like
+    ASCII. ``high`` is None when the range runs to the end.
+    """
+    head = prefix
+    while head:
+        last = _DECODE[head[-1]]
+        if last < len(_BASE32) - 1:
+            return prefix, head[:-1] + _BASE32[last + 1]
+        head = head[:-1]
+    return prefix, None
+
+
+def cell_ranges(cells):
+    """Merge sorted prefixes into as few [low, high) ranges as possible"""
+    ranges = []
+    for cell in sorted(cells):
+        low, high = prefix_range(cell)
+        if ranges and ranges[-1][1] == low:
+            ranges[-1] = (ranges[-1][0], high)
+        else:
+            ranges.append((low, high))
+    return ranges
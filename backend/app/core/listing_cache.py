@@ -0,0 +1,113 @@
+"""Conditional GET and a short-lived response cache for report listings.
+
+A listing's ETag combines the change counter of its scope (app/db/report_versions.py:
+the caller's own reports, or every report for admins) with a digest of the path
+and query string. Reading the counter is a primary-key lookup, so a request
+whose If-None-Match still matches gets 304 Not Modified without touching the
+reports table. Responses carry ``Cache-Control: private, no-cache``, so
+browsers revalidate every time and reuse their copy on 304.
+
+Encoded bodies are also kept in a per-process LRU keyed on the ETag. Because
+the key contains the counter, a cached body is never served after a change;
+REPORT_CACHE_TTL only bounds how long unused pages stay in memory. Set it to 0
+to disable the cache.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import Request, Response
+
+from app.core.responses import rows_response
+from app.db import report_versions
+
+REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL", "5"))
+REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", "256"))
+
+
+class ResponseCache:
+    """Thread-safe LRU of encoded response bodies with a per-entry TTL"""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+listing_cache = ResponseCache(maxsize=REPORT_CACHE_SIZE, ttl=REPORT_CACHE_TTL)
+
+
+def listing_etag(request: Request, scope: int, version: int) -> str:
+    query = sorted(request.query_params.multi_items())
+    digest = hashlib.blake2b(f"{request.url.path}?{query}".encode(), digest_size=8).hexdigest()
+    return f'W/"{scope}.{version}.{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison against an If-None-Match header value"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in tags)
+
+
+def conditional_listing(request: Request, db, scope: int, fields, build):
+    """304, cached body or a freshly built listing for ``scope``.
+
+    ``build()`` returns (rows, headers) and only runs on a cache miss. The
+    counter is read before the rows, so a body is never older than its ETag.
+    """
+    etag = listing_etag(request, scope, report_versions.read(db, scope))
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    cached = listing_cache.get(etag)
+    if cached is None:
+        rows, page_headers = build()
+        cached = (rows_response(fields, rows).body, page_headers)
+        listing_cache.set(etag, cached)
+    body, page_headers = cached
+    return Response(body, media_type="application/json", headers={**page_headers, **headers})
@@ -0,0 +1,232 @@
+"""Process-local metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms are plain dicts keyed by label values and
+guarded by one lock each; recording a sample is a dict lookup, a bisect and
+a few additions, so the instrumentation can stay on in production. With
+several workers, scrape each one (every worker serves its own /metrics).
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds in seconds, from sub-millisecond DB queries to slow requests
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+_metrics = []
+_collectors = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+        _metrics.append(self)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._samples(labels, value) for labels, value in items)
+        return "\n".join(line for line in lines if line)
+
+    def _samples(self, labels, value):
+        return f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, seconds, *labels):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # [per-bucket counts (not cumulative), sum, count]
+                state = self._values[labels] = [[0] * len(self.buckets), 0.0, 0]
+            state[0][index] += 1
+            state[1] += seconds
+            state[2] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def _samples(self, labels, state):
+        counts, total, count = state
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets, counts):
+            cumulative += n
+            le = 'le="' + _format_value(bound) + '"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+        suffix = _format_labels(self.labelnames, labels)
+        lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+        lines.append(f"{self.name}_count{suffix} {count}")
+        return "\n".join(lines)
+
+
+def register_collector(fn):
+    """Add a callable run at scrape time that yields (name, kind, help, value) tuples"""
+    _collectors.append(fn)
+    return fn
+
+
+def render() -> str:
+    parts = [metric.render() for metric in _metrics]
+    for collector in _collectors:
+        for name, kind, documentation, value in collector():
+            parts.append(f"# HELP {name} {documentation}\n# TYPE {name} {kind}\n{name} {_format_value(value)}")
+    return "\n".join(parts) + "\n"
+
+
+# -- HTTP --------------------------------------------------------------------
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status code", ("method", "route", "status")
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served")
+HTTP_EXCEPTIONS = Counter(
+    "http_request_exceptions_total", "Requests that raised an unhandled exception", ("method", "route")
+)
+
+# -- work inside requests ------------------------------------------------------
+
+DB_QUERY_LATENCY = Histogram("db_query_duration_seconds", "Duration of each database query")
+PASSWORD_HASH_LATENCY = Histogram(
+    "password_hash_duration_seconds", "argon2 hash and verify time", ("operation",)
+)
+PREDICT_STAGE_LATENCY = Histogram(
+    "ai_predict_stage_duration_seconds",
+    "Time spent in the keyword rules and in the ML model per predict call",
+    ("stage",),
+)
+PREDICTIONS = Counter(
+    "ai_predictions_total", "Department predictions by the path that produced them", ("path",)
+)
+PREDICT_ERRORS = Counter(
+    "ai_model_errors_total", "model.predict calls that raised, by model version", ("model_version",)
+)
+
+# -- background work -----------------------------------------------------------
+
+ENRICHMENT_JOBS = Counter(
+    "enrichment_jobs_total", "AI enrichment jobs finished, by result", ("result",)
+)
+ENRICHMENT_BATCH_LATENCY = Histogram(
+    "enrichment_batch_duration_seconds", "Time to classify, score and store one micro-batch"
+)
+ENRICHMENT_LAG = Histogram(
+    "enrichment_lag_seconds", "Time from report creation to completed enrichment",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+
+
+class PredictObserver:
+    """Receives timings from ai.predict (the AI package does not import the app)"""
+
+    def stage(self, stage, seconds):
+        PREDICT_STAGE_LATENCY.observe(seconds, stage)
+
+    def results(self, path, count=1):
+        PREDICTIONS.inc(path, amount=count)
+
+    def model_error(self, version):
+        PREDICT_ERRORS.inc(str(version))
+
+
+class MetricsMiddleware:
+    """Per-route request counts, latency, in-flight requests and exceptions"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status_code = 500
+        started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            HTTP_EXCEPTIONS.inc(scope["method"], _route(scope))
+            raise
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = _route(scope)
+            HTTP_LATENCY.observe(time.perf_counter() - started, scope["method"], route)
+            HTTP_REQUESTS.inc(scope["method"], route, str(status_code))
+
+
+def _route(scope):
+    # The route template keeps label cardinality bounded; unmatched paths
+    # (404 scans) are folded into one label value
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
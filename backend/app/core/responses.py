@@ -0,0 +1,23 @@
+"""Fast JSON responses for large report listings.
+
+With a ``response_model``, FastAPI validates every ORM object into a Pydantic
+model and runs the result through ``jsonable_encoder``. Without one, it
+introspects each object. For list endpoints that return hundreds of rows, that
+work costs more than the query. Listings instead select only the columns of
+the response schema and encode the row tuples directly with orjson. The
+response_model on the route is still used for the OpenAPI schema.
+"""
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+def rows_response(fields, rows, headers=None) -> ORJSONResponse:
+    """Encode row tuples as a JSON array of objects keyed by ``fields``"""
+    return ORJSONResponse([dict(zip(fields, row)) for row in rows], headers=headers)
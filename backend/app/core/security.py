@@ -1,9 +1,12 @@
 from passlib.context import CryptContext
 
+from app.core.metrics import PASSWORD_HASH_LATENCY
+
 # Use argon2 which is more modern and has better compatibility
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
 def hash_password(password: str) -> str:
     """Hash password using Argon2"""
-    return pwd_context.hash(password)
+    with PASSWORD_HASH_LATENCY.time("hash"):
+        return pwd_context.hash(password)
 
@@ -0,0 +1,179 @@
+import base64
+import binascii
+import hashlib
+import io
+import os
+import re
+import tempfile
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:  # thumbnails are optional; originals are served instead
+    Image = None
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+PHOTO_STORAGE_DIR = Path(os.getenv("PHOTO_STORAGE_DIR", str(BACKEND_DIR / "media" / "photos")))
+MAX_PHOTO_BYTES = int(os.getenv("MAX_PHOTO_BYTES", str(10 * 1024 * 1024)))
+THUMBNAIL_SIZE = (320, 320)
+CHUNK_SIZE = 1024 * 1024
+
+PHOTO_URL_PREFIX = "/photos/"
+_PHOTO_ID = re.compile(r"^[0-9a-f]{64}$")
+_DATA_URL = re.compile(r"^data:(?P<mime>[\w/+.-]+)?(?:;[\w=.-]+)*;base64,", re.IGNORECASE)
+
+# Magic bytes of the accepted image formats
+_SIGNATURES = [
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+]
+
+
+class PhotoError(ValueError):
+    pass
+
+
+def sniff_content_type(head: bytes):
+    for signature, mime in _SIGNATURES:
+        if head.startswith(signature):
+            return mime
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def is_photo_id(photo_id: str) -> bool:
+    return bool(_PHOTO_ID.match(photo_id))
+
+
+def photo_path(photo_id: str) -> Path:
+    return PHOTO_STORAGE_DIR / photo_id[:2] / photo_id
+
+
+def thumbnail_path(photo_id: str) -> Path:
+    return PHOTO_STORAGE_DIR / "thumbs" / photo_id[:2] / f"{photo_id}.jpg"
+
+
+def photo_url(photo_id: str) -> str:
+    return PHOTO_URL_PREFIX + photo_id
+
+
+class PhotoWriter:
+    """Hashes a photo while spooling it to a temp file in the blob store.
+
+    Chunks are fed with write(); the first chunk past MAX_PHOTO_BYTES raises
+    PhotoError, so an oversized upload is never written out in full.
+    commit() moves the file to its content address; abort() discards it.
+    """
+
+    def __init__(self):
+        PHOTO_STORAGE_DIR.mkdir(parents=True, exist_ok=True)
+        self._digest = hashlib.sha256()
+        self._head = b""
+        self.size = 0
+        fd, self._tmp_name = tempfile.mkstemp(dir=PHOTO_STORAGE_DIR, prefix=".upload-")
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes):
+        if len(self._head) < 16:
+            self._head += chunk[:16]
+        self.size += len(chunk)
+        if self.size > MAX_PHOTO_BYTES:
+            raise PhotoError(f"Photo exceeds {MAX_PHOTO_BYTES} bytes")
+        self._digest.update(chunk)
+        self._file.write(chunk)
+
+    def commit(self) -> str:
+        """Store the photo (identical content only once) and return its SHA-256 id"""
+        self._file.close()
+        if self.size == 0 or sniff_content_type(self._head) is None:
+            raise PhotoError("Unsupported or empty image")
+
+        photo_id = self._digest.hexdigest()
+        target = photo_path(photo_id)
+        if target.exists():
+            os.unlink(self._tmp_name)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self._tmp_name, target)
+        return photo_id
+
+    def abort(self):
+        self._file.close()
+        if os.path.exists(self._tmp_name):
+            os.unlink(self._tmp_name)
+
+
+def save_photo(stream) -> str:
+    """Copy a binary stream into the blob store and return its SHA-256 id.
+
+    The stream is hashed while it is written to a temp file in chunks, so
+    memory stays flat; identical content is stored only once.
+    """
+    writer = PhotoWriter()
+    try:
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            writer.write(chunk)
+        photo_id = writer.commit()
+    except BaseException:
+        writer.abort()
+        raise
+
+    make_thumbnail(photo_id)
+    return photo_id
+
+
+def make_thumbnail(photo_id: str):
+    """Write a downscaled JPEG next to the original; no-op without Pillow"""
+    target = thumbnail_path(photo_id)
+    if Image is None or target.exists():
+        return
+    try:
+        with Image.open(photo_path(photo_id)) as img:
+            img.thumbnail(THUMBNAIL_SIZE)
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix(".tmp")
+            img.save(tmp, "JPEG", quality=80, optimize=True)
+            os.replace(tmp, target)
+    except OSError:
+        # Undecodable image: the original is still served in place of a thumbnail
+        pass
+
+
+def save_data_url(value: str) -> str:
+    """Store an inline base64 data URL and return its photo id"""
+    match = _DATA_URL.match(value)
+    if not match:
+        raise PhotoError("Not a base64 data URL")
+    try:
+        raw = base64.b64decode(value[match.end():], validate=False)
+    except binascii.Error as e:
+        raise PhotoError(f"Invalid base64 photo: {e}")
+    return save_photo(io.BytesIO(raw))
+
+
+def is_data_url(value: str | None) -> bool:
+    return bool(value) and value[:5].lower() == "data:"
+
+
+def normalize_photo_url(value: str | None) -> str | None:
+    """Validate a report's photo_url, turning an inline data URL into a blob reference.
+
+    Only None, a data URL or a /photos/<sha256> reference to a stored photo
+    are accepted, so arbitrary strings never end up in the column.
+    """
+    if not value:
+        return None
+    if is_data_url(value):
+        return photo_url(save_data_url(value))
+    photo_id = value[len(PHOTO_URL_PREFIX):] if value.startswith(PHOTO_URL_PREFIX) else ""
+    if not is_photo_id(photo_id) or not photo_path(photo_id).exists():
+        raise PhotoError("photo_url must be a data URL or a /photos/<id> reference from POST /photos/")
+    return value
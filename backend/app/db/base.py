@@ -3,4 +3,7 @@ from app.db.base_class import Base
 # Import all models here so SQLAlchemy can discover them
 from app.models.user import User
 from app.models.report import Report
+from app.models.report_stat import ReportStat
+from app.models.enrichment_job import EnrichmentJob
+from app.models.report_version import ReportVersion
 
@@ -0,0 +1,98 @@
+"""Create the database schema, or bring an existing one up to date.
+
+The API no longer touches the schema on import; run this once per deployment
+(and after pulling model changes) from the backend directory:
+
+    python -m app.db.init_db
+
+Missing tables are created. Columns added to existing models since a table was
+created are added with ``ALTER TABLE ... ADD COLUMN``. Columns are never
+dropped, renamed or retyped. Indexes declared on the models but missing from
+existing tables (e.g. the listing indexes on reports) are created, on
+PostgreSQL with ``CREATE INDEX CONCURRENTLY`` so writes continue meanwhile.
+"""
+import re
+
+from sqlalchemy import inspect, literal, text
+from sqlalchemy.schema import CreateIndex
+
+from app.db import search
+from app.db.base import Base
+from app.db.database import engine
+
+
+def _column_ddl(column, dialect):
+    ddl = f"{dialect.identifier_preparer.quote(column.name)} {column.type.compile(dialect=dialect)}"
+    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+    if default is not None:
+        # Existing rows get the model default, which NOT NULL columns require
+        ddl += " DEFAULT " + str(literal(default, column.type).compile(
+            dialect=dialect, compile_kwargs={"literal_binds": True}
+        ))
+    if not column.nullable and default is not None:
+        ddl += " NOT NULL"
+    return ddl
+
+
+def add_missing_columns(engine):
+    """Add model columns missing from existing tables; returns "table.column" names"""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            present = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in present:
+                    continue
+                conn.execute(text(
+                    f"ALTER TABLE {engine.dialect.identifier_preparer.quote(table.name)} "
+                    f"ADD COLUMN {_column_ddl(column, engine.dialect)}"
+                ))
+                added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def create_missing_indexes(engine):
+    """Create model indexes missing from existing tables; returns their names"""
+    inspector = inspect(engine)
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        present = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        missing.extend(index for index in table.indexes if index.name not in present)
+    if not missing:
+        return []
+
+    concurrently = engine.dialect.name == "postgresql"
+    # CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if concurrently:
+            # Building an index on a large table outlasts DB_STATEMENT_TIMEOUT_MS
+            conn.execute(text("SET statement_timeout = 0"))
+        for index in missing:
+            ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect))
+            if concurrently:
+                # An interrupted concurrent build leaves an INVALID index that
+                # IF NOT EXISTS skips; drop it by hand and run init_db again
+                ddl = re.sub(r"^CREATE (UNIQUE )?INDEX", r"CREATE \1INDEX CONCURRENTLY", ddl)
+            conn.execute(text(ddl))
+        if concurrently:
+            conn.execute(text("RESET statement_timeout"))
+    return [index.name for index in missing]
+
+
+def init_db():
+    Base.metadata.create_all(bind=engine)
+    added = add_missing_columns(engine)
+    added += create_missing_indexes(engine)
+    # Adds the full-text search column to reports tables created before it existed
+    search.ensure_schema(engine)
+    return added
+
+
+if __name__ == "__main__":
+    for name in init_db():
+        print(f"Added {name}")
+    print(f"Schema is up to date ({engine.url.render_as_string(hide_password=True)})")
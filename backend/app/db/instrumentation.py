@@ -0,0 +1,136 @@
+"""Per-request database instrumentation.
+
+An ASGI middleware puts a RequestDBStats object in a context variable; engine
+events add every query's count and duration to it, and pool events remember
+which request holds each checked-out connection. Context variables are copied
+into Starlette's threadpool, so sync routes are attributed correctly too.
+"""
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from app.core.metrics import DB_QUERY_LATENCY
+
+_current = ContextVar("db_request_stats", default=None)
+_lock = threading.Lock()
+
+# route -> [requests, queries, db_seconds]
+route_totals = {}
+# id(dbapi connection) -> (RequestDBStats or None, checkout time)
+checked_out = {}
+
+
+class RequestDBStats:
+    __slots__ = ("scope", "queries", "db_time")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queries = 0
+        self.db_time = 0.0
+
+    @property
+    def route(self):
+        return route_name(self.scope)
+
+
+def route_name(scope):
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+def current():
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    DB_QUERY_LATENCY.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+
+def _checkout(dbapi_connection, connection_record, connection_proxy):
+    checked_out[id(dbapi_connection)] = (_current.get(), time.monotonic())
+
+
+def _checkin(dbapi_connection, connection_record):
+    checked_out.pop(id(dbapi_connection), None)
+
+
+def instrument_engine(engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.pool, "checkout", _checkout)
+    event.listen(engine.pool, "checkin", _checkin)
+
+
+def _record(stats):
+    route = stats.route
+    with _lock:
+        totals = route_totals.setdefault(route, [0, 0, 0.0])
+        totals[0] += 1
+        totals[1] += stats.queries
+        totals[2] += stats.db_time
+
+
+class DBInstrumentationMiddleware:
+    """Counts queries and DB time per request and reports them in Server-Timing"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestDBStats(scope)
+        token = _current.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((
+                    b"server-timing",
+                    f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries"'.encode(),
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            _record(stats)
+
+
+def snapshot(engine=None) -> dict:
+    """Per-route query totals and the connections currently held"""
+    now = time.monotonic()
+    with _lock:
+        routes = {
+            route: {
+                "requests": requests,
+                "queries": queries,
+                "db_time_ms": round(db_time * 1000, 3),
+                "avg_queries": round(queries / requests, 3) if requests else 0.0,
+                "avg_db_time_ms": round(db_time * 1000 / requests, 3) if requests else 0.0,
+            }
+            for route, (requests, queries, db_time) in route_totals.items()
+        }
+    held = [
+        {"route": stats.route if stats else None, "held_ms": round((now - since) * 1000, 1)}
+        for stats, since in list(checked_out.values())
+    ]
+    result = {"routes": routes, "connections_held": held}
+    if engine is not None:
+        result["pool"] = engine.pool.status()
+    return result
@@ -0,0 +1,61 @@
+"""One-off migration: move inline base64 photos out of reports.photo_url.
+
+Each data URL is written to the content-addressed blob store and the column is
+rewritten to its short /photos/<sha256> reference. Each batch bumps the
+listing counters of its owners in the same transaction, so cached listings
+and ETags never outlive the rewrite. Safe to re-run.
+
+Run from the backend directory:
+
+    python -m app.db.migrate_photos
+"""
+from sqlalchemy import select, update
+
+from app.core.storage import PhotoError, photo_url, save_data_url
+from app.db import report_versions
+from app.db.database import SessionLocal
+from app.models.report import Report
+
+BATCH_SIZE = 100
+
+
+def migrate():
+    db = SessionLocal()
+    migrated = failed = 0
+    last_id = 0
+    try:
+        while True:
+            rows = db.execute(
+                select(Report.id, Report.photo_url, Report.user_id)
+                .where(Report.id > last_id, Report.photo_url.like("data:%"))
+                .order_by(Report.id)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+
+            owners = set()
+            for report_id, value, user_id in rows:
+                try:
+                    reference = photo_url(save_data_url(value))
+                except PhotoError as e:
+                    print(f"Report {report_id}: skipped ({e})")
+                    failed += 1
+                    continue
+                db.execute(update(Report).where(Report.id == report_id).values(photo_url=reference))
+                owners.add(user_id)
+                migrated += 1
+
+            if owners:
+                db.execute(report_versions.bump(db.bind.dialect.name, owners))
+            db.commit()
+            last_id = rows[-1][0]
+            print(f"Migrated {migrated} photos (up to report {last_id})")
+    finally:
+        db.close()
+
+    print(f"Done: {migrated} migrated, {failed} skipped")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,24 @@
+"""Rebuild the report_stats summary table from the reports table.
+
+Run from the backend directory:
+
+    python -m app.db.rebuild_stats
+"""
+from app.db.base import Base
+from app.db.database import SessionLocal, engine
+from app.db.report_stats import rebuild
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        total = rebuild(db)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Rebuilt report stats from {total} reports")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+from collections import Counter
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models.report import Report
+from app.models.report_stat import ReportStat
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def bucket(status, department, category):
+    return (status or "", department or "", category or "")
+
+
+def stats_upsert(dialect_name: str, deltas: Counter):
+    """Statement adding each delta to its bucket (insert-or-increment).
+
+    Returns None when there is nothing to change.
+    """
+    rows = [
+        {"status": s, "department": d, "category": c, "count": n}
+        for (s, d, c), n in deltas.items() if n
+    ]
+    if not rows:
+        return None
+
+    stmt = _UPSERT_INSERTS[dialect_name](ReportStat).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["status", "department", "category"],
+        set_={"count": ReportStat.count + stmt.excluded.count},
+    )
+
+
+def created_deltas(reports):
+    return Counter(bucket(r["status"], r["department"], r["category"]) for r in reports)
+
+
+def moved_deltas(moves):
+    """Deltas for (old_bucket, new_bucket) pairs"""
+    deltas = Counter()
+    for old, new in moves:
+        if old != new:
+            deltas[old] -= 1
+            deltas[new] += 1
+    return deltas
+
+
+def read_stats(db):
+    """Totals by status, department and category from the summary table"""
+    result = {"total": 0, "by_status": Counter(), "by_department": Counter(), "by_category": Counter()}
+    for row in db.execute(select(ReportStat).where(ReportStat.count != 0)).scalars():
+        result["total"] += row.count
+        result["by_status"][row.status] += row.count
+        result["by_department"][row.department or None] += row.count
+        result["by_category"][row.category or None] += row.count
+    return result
+
+
+def rebuild(db):
+    """Recompute every bucket from the reports table (repairs drift)"""
+    db.execute(delete(ReportStat))
+    grouped = db.execute(
+        select(Report.status, Report.department, Report.category, func.count())
+        .group_by(Report.status, Report.department, Report.category)
+    ).all()
+    totals = Counter()
+    for status, department, category, count in grouped:
+        totals[bucket(status, department, category)] += count
+    if totals:
+        db.execute(insert(ReportStat), [
+            {"status": s, "department": d, "category": c, "count": n}
+            for (s, d, c), n in totals.items()
+        ])
+    return sum(totals.values())
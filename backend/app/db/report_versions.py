@@ -0,0 +1,27 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models.report_version import ReportVersion
+
+GLOBAL_SCOPE = 0
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def bump(dialect_name: str, user_ids):
+    """Statement incrementing the global counter and those of ``user_ids``"""
+    # Sorted, so concurrent transactions lock the rows in the same order
+    scopes = sorted({GLOBAL_SCOPE, *(u for u in user_ids if u is not None)})
+    stmt = _UPSERT_INSERTS[dialect_name](ReportVersion).values(
+        [{"scope": scope, "version": 1} for scope in scopes]
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=["scope"],
+        set_={"version": ReportVersion.version + 1},
+    )
+
+
+def read(db, scope: int) -> int:
+    """Current counter of one scope (0 before its first change)"""
+    version = db.execute(select(ReportVersion.version).where(ReportVersion.scope == scope)).scalar()
+    return version or 0
@@ -0,0 +1,182 @@
+"""Ranked full-text search over report titles, descriptions and AI summaries.
+
+PostgreSQL matches against the generated ``search_vector`` column through its
+GIN index (declared in app/models/report.py) and ranks with ``ts_rank_cd``.
+Other databases (SQLite in development and tests) use an in-process inverted
+index with BM25 ranking. Before each search it indexes reports with an id above
+the last one it has seen, so rows inserted by any worker are picked up; the
+enrichment worker re-indexes reports once their AI summary is filled in.
+
+Add the column and index to an existing PostgreSQL database with:
+
+    python -m app.db.search
+"""
+import math
+import re
+import threading
+from collections import defaultdict
+
+from sqlalchemy import func, literal_column, select, text
+
+from app.models.report import SEARCH_CONFIG, SEARCH_VECTOR_DDL, Report
+
+# Relative weight of each field, mirroring the A/B/C weights of the tsvector
+FIELD_WEIGHTS = {"title": 2.0, "description": 1.0, "ai_summary": 0.5}
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the there "
+    "this to was were will with".split()
+)
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Ranked ids fetched from the database per round trip by the fallback
+FETCH_CHUNK = 500
+
+
+def tokenize(text: str):
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+class InvertedIndex:
+    """term -> {report id: weighted term frequency}, ranked with BM25"""
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._postings = defaultdict(dict)
+        self._terms = {}
+        self._lengths = {}
+        self._total_length = 0.0
+        self.last_id = 0
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def add(self, report_id: int, fields):
+        frequencies = defaultdict(float)
+        length = 0.0
+        for field, weight in FIELD_WEIGHTS.items():
+            tokens = tokenize(fields.get(field) or "")
+            for token in tokens:
+                frequencies[token] += weight
+            length += weight * len(tokens)
+
+        with self._lock:
+            if report_id in self._lengths:
+                self._remove(report_id)
+            for term, tf in frequencies.items():
+                self._postings[term][report_id] = tf
+            self._terms[report_id] = tuple(frequencies)
+            self._lengths[report_id] = length
+            self._total_length += length
+
+    def update(self, report_id: int, fields):
+        """Re-index a report whose text changed; unseen reports are left to sync()"""
+        if report_id in self._lengths:
+            self.add(report_id, fields)
+
+    def _remove(self, report_id):
+        for term in self._terms.pop(report_id):
+            postings = self._postings[term]
+            postings.pop(report_id, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(report_id)
+
+    def search(self, query: str):
+        """Ids of reports containing every query term, best match first"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        with self._lock:
+            postings = [self._postings.get(term) for term in terms]
+            if not all(postings):
+                return []
+            postings.sort(key=len)
+            ids = set(postings[0]).intersection(*postings[1:])
+
+            n = len(self._lengths)
+            average = (self._total_length / n) or 1.0
+            scores = dict.fromkeys(ids, 0.0)
+            for posting in postings:
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for report_id in ids:
+                    tf = posting[report_id]
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[report_id] / average)
+                    scores[report_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return sorted(ids, key=lambda i: (-scores[i], -i))
+
+    def sync(self, db, batch_size=1000):
+        """Index reports created since the last sync"""
+        with self._sync_lock:
+            while True:
+                rows = db.execute(
+                    select(Report.id, Report.title, Report.description, Report.ai_summary)
+                    .where(Report.id > self.last_id)
+                    .order_by(Report.id)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+                for row in rows:
+                    self.add(row.id, row._mapping)
+                self.last_id = rows[-1].id
+
+
+fallback_index = InvertedIndex()
+
+
+def _search_postgres(query, q, offset, limit):
+    vector = literal_column("reports.search_vector")
+    tsquery = func.websearch_to_tsquery(text(f"'{SEARCH_CONFIG}'::regconfig"), q)
+    return (
+        query.filter(vector.op("@@")(tsquery))
+        .order_by(func.ts_rank_cd(vector, tsquery).desc(), Report.id.desc())
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+
+
+def _search_fallback(db, query, q, offset, limit):
+    fallback_index.sync(db)
+    ranked = fallback_index.search(q)
+
+    # Filters are applied by the database on chunks of ranked ids, in rank order
+    wanted = offset + limit
+    rows = []
+    for start in range(0, len(ranked), FETCH_CHUNK):
+        chunk = ranked[start:start + FETCH_CHUNK]
+        found = {r.id: r for r in query.filter(Report.id.in_(chunk)).all()}
+        rows.extend(found[i] for i in chunk if i in found)
+        if len(rows) >= wanted:
+            break
+    return rows[offset:wanted]
+
+
+def search(db, query, q: str, offset: int, limit: int):
+    """Rank the reports selected by ``query`` (an ORM query, already filtered) against ``q``"""
+    if db.bind.dialect.name == "postgresql":
+        return _search_postgres(query, q, offset, limit)
+    return _search_fallback(db, query, q, offset, limit)
+
+
+def ensure_schema(engine):
+    """Add the search column and GIN index to an existing PostgreSQL database"""
+    if engine.dialect.name != "postgresql":
+        return False
+    with engine.begin() as conn:
+        for statement in SEARCH_VECTOR_DDL:
+            conn.execute(text(statement))
+    return True
+
+
+if __name__ == "__main__":
+    from app.db.database import engine
+
+    if ensure_schema(engine):
+        print("reports.search_vector and its GIN index are in place")
+    else:
+        print(f"{engine.dialect.name}: search uses the in-process index, nothing to set up")
@@ -1,18 +1,38 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from app.routers import admin
 
 
-from app.db.database import engine
-from app.db.base import Base
-from app.models import user, report
+from app.db.instrumentation import DBInstrumentationMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import MetricsMiddleware, PredictObserver
 from app.routers import user as user_router
 from app.routers import report as report_router
+from app.routers import photo as photo_router
+from app.routers import metrics as metrics_router
+from app.routers import health as health_router
+from ai import predict
+from app.core import duplicates, enrichment
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nothing here blocks startup: the model warms up, the near-duplicate
+    # index fills and the enrichment queue drains in background threads, and
+    # /health/ready reports when the worker is ready. The schema is managed by `python -m app.db.init_db`.
+    predict.registry.warm_up()
+    duplicates.rebuild_in_background()
+    enrichment.worker.start()
+    yield
+    enrichment.worker.stop()
 
 
 app = FastAPI(
     title="FixIt API",
+    lifespan=lifespan,
     swagger_ui_parameters={"url": "/openapi.json"}
 )
 
@@ -23,14 +43,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-After-Id", "X-Next-After-Priority", "X-Next-Offset", "Server-Timing", "ETag"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(DBInstrumentationMiddleware)
+app.add_middleware(MetricsMiddleware)
 
-Base.metadata.create_all(bind=engine)
+predict.observer = PredictObserver()
 
 # Then add routes
 app.include_router(admin.router)
 app.include_router(user_router.router)
 app.include_router(report_router.router)
+app.include_router(photo_router.router)
+app.include_router(metrics_router.router)
+app.include_router(health_router.router)
 
 @app.get("/")
 def root():
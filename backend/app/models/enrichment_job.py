@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from app.db.base_class import Base
+
+
+class EnrichmentJob(Base):
+    """A report waiting for AI enrichment (see app/core/enrichment.py).
+
+    Inserted in the same transaction as the report, so a crash between the
+    response and the enrichment never loses work. Rows are deleted once the
+    report is enriched; failed ones stay for inspection.
+    """
+    __tablename__ = "enrichment_jobs"
+
+    id = Column(Integer, primary_key=True)
+    report_id = Column(Integer, ForeignKey("reports.id"), nullable=False, unique=True)
+    status = Column(String, nullable=False, default="pending")  # pending / running / failed
+    attempts = Column(Integer, nullable=False, default=0)
+    locked_at = Column(DateTime, nullable=True)  # When a worker claimed it; stale claims are retried
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_enrichment_jobs_status_id", "status", "id"),
+    )
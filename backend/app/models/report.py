@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
+from sqlalchemy import DDL, Column, Integer, String, ForeignKey, Boolean, Float, Index, JSON, event
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 
@@ -12,9 +12,47 @@ class Report(Base):
     status = Column(String, default="pending")
     category = Column(String, default="general")
     priority = Column(String, default="medium")
+    priority_score = Column(Integer, nullable=False, default=0)  # 0-100, see ai/priority.py
+    enrichment_state = Column(String, nullable=True)  # pending / done / failed (AI enrichment queue)
 
     ai_summary = Column(String, nullable=True)
     suspicious_flag = Column(Boolean, default=False)
-    photo_url = Column(String, nullable=True)  # Path to uploaded photo
+    duplicate_of = Column(JSON, nullable=True)  # Ids of earlier near-duplicate reports
+    photo_url = Column(String, nullable=True)  # Blob store reference, e.g. /photos/<sha256>
+    model_version = Column(String, nullable=True)  # AI model that classified the report
+
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geocell = Column(String, nullable=True)  # Geohash of the location, see app/core/geo.py
 
     user_id = Column(Integer, ForeignKey("users.id"))
+
+    # Keyset pagination indexes: equality filters first, then id for the range
+    __table_args__ = (
+        Index("ix_reports_user_id_id", "user_id", "id"),
+        Index("ix_reports_status_department_id", "status", "department", "id"),
+        Index("ix_reports_department_id", "department", "id"),
+        Index("ix_reports_category_id", "category", "id"),
+        # Priority-sorted queues: ORDER BY priority_score DESC, id DESC
+        Index("ix_reports_priority_score_id", "priority_score", "id"),
+        Index("ix_reports_status_priority_score_id", "status", "priority_score", "id"),
+        # Spatial queries: each covering geohash cell is a range scan on geocell
+        Index("ix_reports_geocell", "geocell"),
+    )
+
+
+# PostgreSQL full-text search (see app/db/search.py): a generated, weighted
+# tsvector column with a GIN index. It is not mapped so other dialects never
+# see it; existing databases get it from `python -m app.db.search`.
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR_DDL = (
+    "ALTER TABLE reports ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(ai_summary, '')), 'C')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_reports_search_vector ON reports USING GIN (search_vector)",
+)
+for _statement in SEARCH_VECTOR_DDL:
+    event.listen(Report.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String
+from app.db.base_class import Base
+
+
+class ReportStat(Base):
+    """Report counts per (status, department, category) bucket.
+
+    Maintained in the same transaction as every report insert or status
+    change, so dashboard reads never have to scan the reports table.
+    """
+    __tablename__ = "report_stats"
+
+    # Missing departments/categories are stored as "" so they can be keys
+    status = Column(String, primary_key=True)
+    department = Column(String, primary_key=True)
+    category = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
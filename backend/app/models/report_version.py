@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer
+from app.db.base_class import Base
+
+
+class ReportVersion(Base):
+    """Change counter behind the ETags of report listings.
+
+    Scope 0 counts every report change; the other rows count changes to one
+    user's reports. Bumped in the same transaction as every report insert,
+    status change and enrichment, so a conditional GET can be answered from
+    this table alone.
+    """
+    __tablename__ = "report_versions"
+
+    scope = Column(Integer, primary_key=True, autoincrement=False)  # 0 or a user id
+    version = Column(Integer, nullable=False, default=0)
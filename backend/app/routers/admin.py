@@ -1,19 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db, engine
+from app.db import instrumentation
 from app.models.user  import User
 from app.core.auth import create_access_token
 from app.core.deps import get_current_user
 from app.core.security import hash_password
+from app.core.admin import admin_required
+from app.core.executor import cpu_pool
+from app.core import enrichment
+from ai.predict import prediction_cache, registry
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 @router.post("/create-admin")
-def create_admin(
+async def create_admin(
     email: str,
     password: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role != "admin":
@@ -22,15 +28,57 @@ def create_admin(
     admin = User(
         name="Admin",
         email=email,
-        password=hash_password(password),
+        password=await cpu_pool.run(hash_password, password),
         role="admin"
     )
 
     db.add(admin)
-    db.commit()
-    db.refresh(admin)
+    await db.commit()
+    await db.refresh(admin)
 
     return {"message": "Admin created", 
             "email": admin.email,
             "role": admin.role
             }
+
+
+@router.get("/prediction-cache")
+def prediction_cache_stats(admin: User = Depends(admin_required)):
+    """Hit/miss/eviction counters of the AI prediction cache"""
+    return prediction_cache.stats()
+
+
+@router.get("/cpu-pool")
+def cpu_pool_stats(admin: User = Depends(admin_required)):
+    """Queue depth and timing of the CPU executor (argon2, model inference)"""
+    return cpu_pool.stats()
+
+
+@router.get("/db")
+def db_stats(admin: User = Depends(admin_required)):
+    """Queries and DB time per route, held connections and pool status"""
+    return instrumentation.snapshot(engine)
+
+
+@router.get("/model")
+def model_status(admin: User = Depends(admin_required)):
+    """Active department model version and available artifacts"""
+    return registry.status()
+
+
+@router.post("/model/reload", status_code=status.HTTP_202_ACCEPTED)
+def reload_model(version: str | None = None, admin: User = Depends(admin_required)):
+    """Load a model version in the background and swap it in once warmed up"""
+    if version is not None and version not in registry.available_versions():
+        raise HTTPException(status_code=404, detail="Unknown model version")
+
+    if not registry.reload(version):
+        raise HTTPException(status_code=409, detail="A model reload is already in progress")
+
+    return {"message": "Model reload started", "version": version or "default"}
+
+
+@router.get("/enrichment")
+def enrichment_status(db: Session = Depends(get_db), admin: User = Depends(admin_required)):
+    """AI enrichment worker counters and queued jobs by state"""
+    return {"worker": enrichment.worker.stats(), "queue": enrichment.queue_depth(db)}
@@ -0,0 +1,47 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import inspect, text
+
+from app.db.database import engine
+from ai.predict import registry
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+def _database_status():
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            migrated = inspect(conn).has_table("reports")
+    except Exception as e:
+        return {"ready": False, "error": repr(e)}
+    if not migrated:
+        return {"ready": False, "error": "Schema missing; run python -m app.db.init_db"}
+    return {"ready": True}
+
+
+@router.get("/live")
+def live():
+    """The process is up and serving requests"""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def ready():
+    """503 until the department model is warm and the database is reachable and migrated"""
+    model = registry.active
+    checks = {
+        "model": {
+            "ready": model.model is not None,
+            "version": model.version,
+            "engine": model.engine,
+            "loading": not registry.initialized,
+            "error": registry.last_error,
+        },
+        "database": _database_status(),
+    }
+    is_ready = all(check["ready"] for check in checks.values())
+    return JSONResponse(
+        {"status": "ready" if is_ready else "not_ready", "checks": checks},
+        status_code=200 if is_ready else 503,
+    )
@@ -0,0 +1,40 @@
+import os
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core import metrics
+from app.core.executor import cpu_pool
+from app.core.listing_cache import listing_cache
+from app.db.database import engine
+from ai.predict import prediction_cache
+
+# When set, scrapers must send "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+router = APIRouter(tags=["Metrics"])
+
+
+@metrics.register_collector
+def _runtime_gauges():
+    pool = cpu_pool.stats()
+    yield "cpu_pool_queued", "gauge", "Jobs waiting for a CPU pool worker", pool["queued"]
+    yield "cpu_pool_running", "gauge", "Jobs running on the CPU pool", pool["running"]
+    yield "cpu_pool_rejected_total", "counter", "Jobs rejected because the queue was full", pool["rejected"]
+    if hasattr(engine.pool, "checkedout"):  # QueuePool; SQLite memory pools have no counter
+        yield "db_pool_checked_out", "gauge", "Database connections currently checked out", engine.pool.checkedout()
+    cache = prediction_cache.stats()
+    yield "ai_prediction_cache_hits_total", "counter", "Prediction cache hits", cache["hits"]
+    yield "ai_prediction_cache_misses_total", "counter", "Prediction cache misses", cache["misses"]
+    listings = listing_cache.stats()
+    yield "report_listing_cache_hits_total", "counter", "Report listing response cache hits", listings["hits"]
+    yield "report_listing_cache_misses_total", "counter", "Report listing response cache misses", listings["misses"]
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics(authorization: str | None = Header(None)):
+    """Prometheus text format; each worker process reports its own counters"""
+    if METRICS_TOKEN and not secrets.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
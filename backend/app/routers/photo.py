@@ -0,0 +1,150 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from python_multipart.multipart import MultipartParseError, MultipartParser, parse_options_header
+
+from app.core.auth import get_current_user
+from app.core.executor import cpu_pool
+from app.core.storage import (
+    MAX_PHOTO_BYTES, PhotoError, PhotoWriter, is_photo_id, make_thumbnail, photo_path,
+    photo_url, sniff_content_type, thumbnail_path,
+)
+from app.models.user import User
+
+router = APIRouter(prefix="/photos", tags=["Photos"])
+
+# Content-addressed: a given URL never changes, so clients may cache forever
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+# Room for the multipart boundaries and part headers around the photo
+MULTIPART_OVERHEAD = 64 * 1024
+
+_UPLOAD_BODY = {
+    "required": True,
+    "content": {"multipart/form-data": {"schema": {
+        "type": "object",
+        "required": ["file"],
+        "properties": {"file": {"type": "string", "format": "binary"}},
+    }}},
+}
+
+
+async def _receive_photo(request: Request) -> str:
+    """Stream the "file" part of a multipart body into the blob store.
+
+    Unlike an UploadFile parameter, nothing is spooled before the size
+    check: the body is parsed as it arrives and writing stops at the first
+    chunk past MAX_PHOTO_BYTES.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type"))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise PhotoError("Expected multipart/form-data with a 'file' field")
+
+    writer = PhotoWriter()
+    part = {"headers": {}, "field": b"", "value": b"", "is_file": False, "found": False}
+
+    def on_header_field(data, start, end):
+        part["field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        part["value"] += data[start:end]
+
+    def on_header_end():
+        part["headers"][part["field"].lower()] = part["value"]
+        part["field"] = part["value"] = b""
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(part["headers"].get(b"content-disposition"))
+        part["is_file"] = disposition.get(b"name") == b"file" and not part["found"]
+        part["found"] = part["found"] or part["is_file"]
+        part["headers"] = {}
+
+    def on_part_data(data, start, end):
+        if part["is_file"]:
+            # Buffered writes of the received chunks; hashing is incremental
+            writer.write(data[start:end])
+
+    def on_part_end():
+        part["is_file"] = False
+
+    parser = MultipartParser(options[b"boundary"], {
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+        if not part["found"]:
+            raise PhotoError("Missing 'file' field")
+        return writer.commit()
+    except MultipartParseError as e:
+        writer.abort()
+        raise PhotoError(f"Malformed multipart body: {e}")
+    except BaseException:
+        writer.abort()
+        raise
+
+
+@router.post("/", openapi_extra={"requestBody": _UPLOAD_BODY})
+async def upload_photo(
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """Upload a photo as multipart form data; returns the short reference to store on a report"""
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > MAX_PHOTO_BYTES + MULTIPART_OVERHEAD:
+        raise HTTPException(status_code=413, detail=f"Photo exceeds {MAX_PHOTO_BYTES} bytes")
+    try:
+        photo_id = await _receive_photo(request)
+    except PhotoError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        # Pillow decoding and resizing are CPU work; keep them off the shared threadpool
+        await cpu_pool.run(make_thumbnail, photo_id)
+    except HTTPException:
+        pass  # pool saturated: the original is served in place of the thumbnail
+
+    return {
+        "photo_id": photo_id,
+        "photo_url": photo_url(photo_id),
+        "thumbnail_url": photo_url(photo_id) + "/thumbnail",
+    }
+
+
+def _serve(path, photo_id: str, request: Request):
+    etag = f'"{photo_id}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE})
+
+    with open(path, "rb") as f:
+        media_type = sniff_content_type(f.read(16)) or "application/octet-stream"
+    return FileResponse(
+        path,
+        media_type=media_type,
+        headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE},
+    )
+
+
+def _original(photo_id: str):
+    if not is_photo_id(photo_id):
+        raise HTTPException(status_code=404, detail="Photo not found")
+    path = photo_path(photo_id)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Photo not found")
+    return path
+
+
+@router.get("/{photo_id}")
+def get_photo(photo_id: str, request: Request):
+    return _serve(_original(photo_id), photo_id, request)
+
+
+@router.get("/{photo_id}/thumbnail")
+def get_thumbnail(photo_id: str, request: Request):
+    original = _original(photo_id)
+    thumb = thumbnail_path(photo_id)
+    return _serve(thumb if thumb.exists() else original, photo_id, request)
@@ -1,62 +1,486 @@
-from fastapi import APIRouter, Depends, HTTPException
+import csv
+import io
+import json
+import math
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, insert, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from ai.predict import predict_department
+from typing import List, Literal
 
-from app.db.database import get_db
+from app.db.database import get_db, get_async_db, SessionLocal
+from app.models.enrichment_job import EnrichmentJob
 from app.models.report import Report
 from app.models.user import User
 from app.core.auth import get_current_user
-from app.schemas.report import ReportOut, ReportCreate, ReportStatusUpdate
+from app.schemas.report import (
+    HotspotOut, ReportBulkStatusUpdate, ReportCreate, ReportNearbyOut, ReportOut, ReportStatusResult,
+    ReportStatusUpdate,
+)
 from app.core.admin import admin_required
+from app.core.executor import cpu_pool
+from app.core.listing_cache import conditional_listing
+from app.core.responses import rows_response
+from app.core import enrichment, geo
+from app.core.storage import PhotoError, is_data_url, normalize_photo_url
+from app.db import report_stats, report_versions, search
 
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
 
 
+def _store_photo(value):
+    try:
+        return normalize_photo_url(value)
+    except PhotoError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _store_photos(values):
+    """Validate photo references and move inline base64 photos into the blob store"""
+    if not any(is_data_url(v) for v in values):
+        # Only a regex match and a stat per reference
+        return [_store_photo(v) for v in values]
+    return await cpu_pool.run(lambda: [_store_photo(v) for v in values])
+
+
+# Category of reports the enrichment worker has not classified yet
+UNCLASSIFIED = "general"
+
+
+def _new_report_row(report: ReportCreate, photo_url, user_id):
+    # Classification, summary, duplicate flag and priority are filled in by
+    # the enrichment worker (app/core/enrichment.py)
+    return {
+        "title": report.title,
+        "description": report.description,
+        "photo_url": photo_url,
+        "status": "pending",
+        "category": UNCLASSIFIED,
+        "department": None,
+        "enrichment_state": "pending",
+        "user_id": user_id,
+        "latitude": report.latitude,
+        "longitude": report.longitude,
+        "geocell": geo.encode(report.latitude, report.longitude) if report.latitude is not None else None,
+    }
+
+
 @router.post("/", response_model=ReportOut)
-def create_report(
+async def create_report(
     report: ReportCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    # AI predicts department / complaint type and generates summary
-    complaint_type, department, ai_summary = predict_department(report.description)
-
-    new_report = Report(
-        title=report.title,
-        description=report.description,
-        status="pending",
-        category=complaint_type,
-        department=department,
-        ai_summary=ai_summary,
-        user_id=current_user.id
-    )
+    """Store the report and queue it for AI enrichment; returns once committed"""
+    [photo_url] = await _store_photos([report.photo_url])
 
+    row = _new_report_row(report, photo_url, current_user.id)
+    new_report = Report(**row)
     db.add(new_report)
-    db.commit()
-    db.refresh(new_report)
+    await db.flush()
+    db.add(EnrichmentJob(report_id=new_report.id))
+    await db.execute(report_stats.stats_upsert(db.bind.dialect.name, report_stats.created_deltas([row])))
+    await db.execute(report_versions.bump(db.bind.dialect.name, [current_user.id]))
+    await db.commit()
+    await db.refresh(new_report)
+    enrichment.worker.notify()
 
     return new_report
 
-@router.get("/admin/all")
+
+# Upper bound on reports inserted by one bulk request
+MAX_BULK_REPORTS = 1000
+
+
+@router.post("/bulk", response_model=List[ReportOut])
+async def create_reports_bulk(
+    reports: List[ReportCreate],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Insert a batch of reports and their enrichment jobs in two statements"""
+    if not reports:
+        return []
+    if len(reports) > MAX_BULK_REPORTS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BULK_REPORTS} reports per request")
+
+    photo_urls = await _store_photos([r.photo_url for r in reports])
+    rows = [_new_report_row(r, photo_url, current_user.id) for r, photo_url in zip(reports, photo_urls)]
+
+    new_reports = (await db.scalars(insert(Report).returning(Report), rows)).all()
+    await db.execute(insert(EnrichmentJob), [{"report_id": r.id} for r in new_reports])
+    await db.execute(report_stats.stats_upsert(db.bind.dialect.name, report_stats.created_deltas(rows)))
+    await db.execute(report_versions.bump(db.bind.dialect.name, [current_user.id]))
+    await db.commit()
+    enrichment.worker.notify()
+
+    return new_reports
+
+
+def report_filters(
+    status: str | None = None,
+    department: str | None = None,
+    category: str | None = None,
+    user_id: int | None = None,
+):
+    """Optional server-side filters shared by the report listings"""
+    return {
+        "status": status,
+        "department": department,
+        "category": category,
+        "user_id": user_id,
+    }
+
+
+def page_params(
+    after_id: int | None = Query(None, ge=0, description="Continue after this report id (X-Next-After-Id)"),
+    limit: int = Query(50, ge=1, le=500),
+    sort: Literal["id", "priority"] = Query("id", description="Oldest first, or highest priority first"),
+    after_priority: int | None = Query(None, ge=0, description="With sort=priority: X-Next-After-Priority"),
+):
+    return {"after_id": after_id, "limit": limit, "sort": sort, "after_priority": after_priority}
+
+
+# Listings select exactly the ReportOut columns and encode the row tuples
+# directly (app/core/responses.py) instead of loading and validating ORM objects
+REPORT_FIELDS = tuple(ReportOut.model_fields)
+REPORT_COLUMNS = [getattr(Report, field) for field in REPORT_FIELDS]
+
+
+def _apply_filters(query, filters: dict):
+    for field, value in filters.items():
+        if value is not None:
+            query = query.where(getattr(Report, field) == value)
+    return query
+
+
+def _page(query, page: dict):
+    """Keyset pagination; returns the rows and the X-Next-After-Id cursor header.
+
+    Filters are equality predicates followed by an id range, so every page is a
+    range scan on one of the composite indexes declared on Report. With
+    sort=priority the cursor is (priority_score, id), scanned backwards on the
+    priority indexes, and X-Next-After-Priority carries the score half.
+    """
+    if page["sort"] == "priority":
+        if page["after_id"] is not None and page["after_priority"] is not None:
+            query = query.filter(
+                tuple_(Report.priority_score, Report.id) < tuple_(page["after_priority"], page["after_id"])
+            )
+        query = query.order_by(Report.priority_score.desc(), Report.id.desc())
+    else:
+        if page["after_id"] is not None:
+            query = query.filter(Report.id > page["after_id"])
+        query = query.order_by(Report.id)
+    rows = query.limit(page["limit"] + 1).all()
+
+    headers = {}
+    if len(rows) > page["limit"]:
+        rows = rows[:page["limit"]]
+        headers["X-Next-After-Id"] = str(rows[-1].id)
+        if page["sort"] == "priority":
+            headers["X-Next-After-Priority"] = str(rows[-1].priority_score)
+    return rows, headers
+
+
+@router.get("/admin/all", response_model=List[ReportOut])
 def get_all_reports_admin(
+    request: Request,
+    filters: dict = Depends(report_filters),
+    page: dict = Depends(page_params),
+    db: Session = Depends(get_db),
+    admin=Depends(admin_required)
+):
+    """Every report; supports If-None-Match (ETag from the global change counter)"""
+    return conditional_listing(
+        request, db, report_versions.GLOBAL_SCOPE, REPORT_FIELDS,
+        lambda: _page(_apply_filters(db.query(*REPORT_COLUMNS), filters), page),
+    )
+
+
+@router.get("/search", response_model=List[ReportOut])
+def search_reports(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to match in title, description and AI summary"),
+    filters: dict = Depends(report_filters),
+    offset: int = Query(0, ge=0, le=10000),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Ranked full-text search; the next page's offset is returned in X-Next-Offset"""
+    if current_user.role != "admin":
+        filters["user_id"] = current_user.id
+    rows = search.search(db, _apply_filters(db.query(*REPORT_COLUMNS), filters), q, offset, limit + 1)
+
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Offset"] = str(offset + limit)
+    return rows_response(REPORT_FIELDS, rows, headers)
+
+
+# Largest search radius accepted by /reports/nearby
+MAX_NEARBY_RADIUS_M = 50_000
+
+
+def bbox_params(
+    min_lat: float | None = Query(None, ge=-90, le=90),
+    min_lon: float | None = Query(None, ge=-180, le=180),
+    max_lat: float | None = Query(None, ge=-90, le=90),
+    max_lon: float | None = Query(None, ge=-180, le=180),
+):
+    """Optional bounding box as (min_lat, min_lon, max_lat, max_lon)"""
+    box = (min_lat, min_lon, max_lat, max_lon)
+    if all(v is None for v in box):
+        return None
+    if any(v is None for v in box):
+        raise HTTPException(status_code=422, detail="Provide all of min_lat, min_lon, max_lat and max_lon")
+    if min_lat > max_lat or min_lon > max_lon:
+        raise HTTPException(status_code=422, detail="min_lat/min_lon must not exceed max_lat/max_lon")
+    return box
+
+
+def _within(query, box):
+    """Reports inside ``box``: geohash range scans, then an exact coordinate check"""
+    ranges = [
+        and_(Report.geocell >= low, Report.geocell < high) if high is not None else Report.geocell >= low
+        for low, high in geo.cell_ranges(geo.cover(*box))
+    ]
+    min_lat, min_lon, max_lat, max_lon = box
+    return query.filter(
+        or_(*ranges),
+        Report.latitude.between(min_lat, max_lat),
+        Report.longitude.between(min_lon, max_lon),
+    )
+
+
+@router.get("/nearby", response_model=List[ReportNearbyOut])
+def get_nearby_reports(
+    lat: float | None = Query(None, ge=-90, le=90),
+    lon: float | None = Query(None, ge=-180, le=180),
+    radius_m: float = Query(200, gt=0, le=MAX_NEARBY_RADIUS_M),
+    box: tuple | None = Depends(bbox_params),
+    filters: dict = Depends(report_filters),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Reports within radius_m of (lat, lon), nearest first, or inside a bounding box, newest first.
+
+    Distances use an equirectangular approximation, accurate to well under 1%
+    at these radii. Boxes crossing the antimeridian are not supported.
+    """
+    if (lat is None) != (lon is None):
+        raise HTTPException(status_code=422, detail="Provide both lat and lon")
+    if (lat is None) == (box is None):
+        raise HTTPException(status_code=422, detail="Provide either lat and lon, or a bounding box")
+    if current_user.role != "admin":
+        filters["user_id"] = current_user.id
+
+    if box is not None:
+        query = _within(_apply_filters(db.query(*REPORT_COLUMNS), filters), box)
+        return rows_response(REPORT_FIELDS, query.order_by(Report.id.desc()).limit(limit).all())
+
+    # Squared distance in degrees of latitude; cos(lat) is fixed for the query
+    dx = (Report.longitude - lon) * math.cos(math.radians(lat))
+    dy = Report.latitude - lat
+    distance2 = (dx * dx + dy * dy).label("distance2")
+    query = _within(_apply_filters(db.query(*REPORT_COLUMNS, distance2), filters), geo.bounding_box(lat, lon, radius_m))
+    rows = (
+        query.filter(distance2 <= (radius_m / geo.METERS_PER_DEGREE) ** 2)
+        .order_by(distance2, Report.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return rows_response(
+        REPORT_FIELDS + ("distance_m",),
+        [(*row[:-1], round(math.sqrt(row[-1]) * geo.METERS_PER_DEGREE, 1)) for row in rows],
+    )
+
+
+@router.get("/hotspots", response_model=List[HotspotOut])
+def get_hotspots(
+    precision: int = Query(6, ge=1, le=geo.GEOHASH_PRECISION, description="Geohash length of each cell; 6 is about 1.2 x 0.6 km"),
+    box: tuple | None = Depends(bbox_params),
+    filters: dict = Depends(report_filters),
+    limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db),
     admin=Depends(admin_required)
 ):
-    return db.query(Report).all()
+    """Cells with the most located reports, grouped on a prefix of the indexed geohash"""
+    cell = func.substr(Report.geocell, 1, precision).label("cell")
+    count = func.count().label("count")
+    query = _apply_filters(db.query(cell, count).filter(Report.geocell.isnot(None)), filters)
+    if box is not None:
+        query = _within(query, box)
+    rows = query.group_by(cell).order_by(count.desc(), cell).limit(limit).all()
+
+    results = []
+    for name, n in rows:
+        lat, lon = geo.decode_center(name)
+        results.append({"cell": name, "latitude": lat, "longitude": lon, "count": n})
+    return results
+
+
+
+EXPORT_COLUMNS = [
+    "id", "title", "description", "status", "category", "department", "priority", "priority_score",
+    "ai_summary", "suspicious_flag", "user_id", "photo_url", "model_version", "enrichment_state",
+    "latitude", "longitude",
+]
+EXPORT_BATCH_SIZE = 1000
+
+
+def _export_rows(filters: dict):
+    """Yield report rows as tuples through a server-side cursor.
+
+    Uses its own session so the cursor stays open for the lifetime of the
+    streaming response, independent of request-scoped dependencies.
+    """
+    db = SessionLocal()
+    try:
+        stmt = select(*(getattr(Report, c) for c in EXPORT_COLUMNS)).order_by(Report.id)
+        stmt = _apply_filters(stmt, filters)
+        result = db.execute(
+            stmt.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+        )
+        for partition in result.partitions():
+            yield partition
+    finally:
+        db.close()
+
+
+def _ndjson_stream(filters: dict):
+    for partition in _export_rows(filters):
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in partition
+        )
+
 
+def _csv_stream(filters: dict):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue()
+    for partition in _export_rows(filters):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(partition)
+        yield buffer.getvalue()
+
+
+@router.get("/admin/export")
+def export_reports(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    filters: dict = Depends(report_filters),
+    admin=Depends(admin_required)
+):
+    """Stream every matching report as NDJSON or CSV with flat memory use"""
+    if format == "csv":
+        return StreamingResponse(
+            _csv_stream(filters),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=reports.csv"},
+        )
+    return StreamingResponse(
+        _ndjson_stream(filters),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=reports.ndjson"},
+    )
+
+
+@router.get("/stats")
+def get_report_stats(
+    db: Session = Depends(get_db),
+    admin=Depends(admin_required)
+):
+    """Dashboard counts by status, department and category from the summary table"""
+    return report_stats.read_stats(db)
 
 
 @router.get("/", response_model=List[ReportOut])
 def get_reports(
+    request: Request,
+    filters: dict = Depends(report_filters),
+    page: dict = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    if current_user.role == "admin":
-        return db.query(Report).all()
-    return db.query(Report).filter(Report.user_id == current_user.id).all()
+    """Supports If-None-Match; the ETag follows the caller's reports (all reports for admins)"""
+    scope = report_versions.GLOBAL_SCOPE
+    if current_user.role != "admin":
+        # Citizens only ever see their own reports
+        filters["user_id"] = scope = current_user.id
+    return conditional_listing(
+        request, db, scope, REPORT_FIELDS,
+        lambda: _page(_apply_filters(db.query(*REPORT_COLUMNS), filters), page),
+    )
+
+
+# Upper bound on reports changed by one bulk status update
+MAX_BULK_STATUS_UPDATE = 5000
+
+
+@router.patch("/status", response_model=List[ReportStatusResult])
+def update_reports_status(
+    data: ReportBulkStatusUpdate,
+    db: Session = Depends(get_db),
+    admin=Depends(admin_required)
+):
+    """Set the status of many reports in a single UPDATE ... WHERE id IN (...).
+
+    The targeted rows are locked and read first, in one query, so every id gets
+    a result and the summary table gets exact deltas.
+    """
+    query = select(Report.id, Report.status, Report.department, Report.category, Report.user_id)
+    if data.ids is not None:
+        ids = list(dict.fromkeys(data.ids))
+        if len(ids) > MAX_BULK_STATUS_UPDATE:
+            raise HTTPException(status_code=422, detail=f"At most {MAX_BULK_STATUS_UPDATE} ids per request")
+        query = query.where(Report.id.in_(ids))
+    else:
+        query = _apply_filters(query, data.filter.model_dump()).order_by(Report.id).limit(MAX_BULK_STATUS_UPDATE + 1)
+    rows = db.execute(query.with_for_update()).all()
+    if data.ids is None and len(rows) > MAX_BULK_STATUS_UPDATE:
+        raise HTTPException(status_code=422, detail=f"Filter matches more than {MAX_BULK_STATUS_UPDATE} reports")
+
+    results = {}
+    changed = []
+    owners = set()
+    moves = []
+    for row in rows:
+        if data.expected_status is not None and row.status != data.expected_status:
+            results[row.id] = ReportStatusResult(id=row.id, result="conflict", status=row.status)
+        elif row.status == data.status:
+            results[row.id] = ReportStatusResult(id=row.id, result="unchanged", status=row.status)
+        else:
+            results[row.id] = ReportStatusResult(id=row.id, result="updated", status=data.status)
+            changed.append(row.id)
+            owners.add(row.user_id)
+            moves.append((
+                report_stats.bucket(row.status, row.department, row.category),
+                report_stats.bucket(data.status, row.department, row.category),
+            ))
+
+    if changed:
+        db.execute(
+            update(Report)
+            .where(Report.id.in_(changed))
+            .values(status=data.status)
+            .execution_options(synchronize_session=False)
+        )
+        stmt = report_stats.stats_upsert(db.bind.dialect.name, report_stats.moved_deltas(moves))
+        if stmt is not None:
+            db.execute(stmt)
+        db.execute(report_versions.bump(db.bind.dialect.name, owners))
+    db.commit()
+
+    if data.ids is None:
+        return list(results.values())
+    return [results.get(i) or ReportStatusResult(id=i, result="not_found") for i in ids]
 
 
 @router.put("/{report_id}/status")
@@ -69,11 +493,20 @@ def update_report_status(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admin can update status")
 
-    report = db.query(Report).filter(Report.id == report_id).first()
+    # Row lock so concurrent updates see each other's status for the stats delta
+    report = db.query(Report).filter(Report.id == report_id).with_for_update().first()
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
+    old = report_stats.bucket(report.status, report.department, report.category)
     report.status = data.status
+    stmt = report_stats.stats_upsert(
+        db.bind.dialect.name,
+        report_stats.moved_deltas([(old, report_stats.bucket(report.status, report.department, report.category))]),
+    )
+    if stmt is not None:
+        db.execute(stmt)
+    db.execute(report_versions.bump(db.bind.dialect.name, [report.user_id]))
     db.commit()
     db.refresh(report)
     return report
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from sqlalchemy.exc import IntegrityError
@@ -7,8 +9,9 @@ import secrets
 from datetime import datetime, timedelta
 
 from app.core.security import hash_password
-from app.core.auth import verify_password, create_access_token, SECRET_KEY
-from app.db.database import get_db
+from app.core.auth import verify_password, create_access_token, principal_cache, SECRET_KEY
+from app.core.executor import cpu_pool
+from app.db.database import get_db, get_async_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse
 
@@ -26,9 +29,11 @@ class ResetPasswordRequest(BaseModel):
 
 
 @router.post("/", response_model=UserResponse)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     try:
-        hashed_pwd = hash_password(user.password)
+        hashed_pwd = await cpu_pool.run(hash_password, user.password)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Password hashing error: {e!r}")
 
@@ -40,34 +45,36 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     )
     db.add(new_user)
     try:
-        db.commit()
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail="User with this email already exists")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         # Temporarily return exception details to help debugging
         raise HTTPException(status_code=500, detail=f"Server error: {e!r}")
 
-    db.refresh(new_user)
+    await db.refresh(new_user)
     return new_user
 
 
 @router.post("/login")
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Login endpoint - accepts form data (username=email, password=password)"""
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await db.scalar(select(User).where(User.email == form_data.username))
 
-    if not user or not verify_password(form_data.password, user.password):
+    if not user or not await cpu_pool.run(verify_password, form_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
 
-    access_token = create_access_token(data={"sub": user.email})
+    access_token = create_access_token(
+        data={"sub": user.email, "uid": user.id, "role": user.role}
+    )
     return {
         "access_token": access_token,
         "token_type": "bearer"
@@ -75,20 +82,22 @@ def login(
 
 
 @router.post("/token")
-def get_token(
+async def get_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Token endpoint for Swagger UI authorize - uses form data"""
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await db.scalar(select(User).where(User.email == form_data.username))
 
-    if not user or not verify_password(form_data.password, user.password):
+    if not user or not await cpu_pool.run(verify_password, form_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
 
-    access_token = create_access_token(data={"sub": user.email})
+    access_token = create_access_token(
+        data={"sub": user.email, "uid": user.id, "role": user.role}
+    )
     return {
         "access_token": access_token,
         "token_type": "bearer"
@@ -128,9 +137,9 @@ def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db
 
 
 @router.post("/reset-password")
-def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db)):
+async def reset_password(request: ResetPasswordRequest, db: AsyncSession = Depends(get_async_db)):
     """Reset password using reset token"""
-    user = db.query(User).filter(User.email == request.email).first()
+    user = await db.scalar(select(User).where(User.email == request.email))
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -147,9 +156,10 @@ def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db))
             raise HTTPException(status_code=400, detail="Reset token has expired")
     
     # Update password
-    user.password = hash_password(request.new_password)
+    user.password = await cpu_pool.run(hash_password, request.new_password)
     user.reset_token = None
     user.reset_token_expires = None
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate(user.id)
     
     return {"message": "Password reset successfully. You can now login with your new password."}
@@ -1,14 +1,53 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+ReportStatus = Literal["pending", "in_progress", "resolved"]
 
 
 class ReportCreate(BaseModel):
     title: str
     description: str
     photo_url: str | None = None
+    latitude: float | None = Field(None, ge=-90, le=90)
+    longitude: float | None = Field(None, ge=-180, le=180)
+
+    @model_validator(mode="after")
+    def both_coordinates(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("Provide both latitude and longitude, or neither")
+        return self
 
 
 class ReportStatusUpdate(BaseModel):
-    status: str
+    status: ReportStatus
+
+
+class ReportSelection(BaseModel):
+    status: ReportStatus | None = None
+    department: str | None = None
+    category: str | None = None
+
+
+class ReportBulkStatusUpdate(BaseModel):
+    """Target reports by id or by filter (exactly one of the two)"""
+    ids: list[int] | None = None
+    filter: ReportSelection | None = None
+    status: ReportStatus
+    # Only reports currently in this status are changed; the rest are conflicts
+    expected_status: ReportStatus | None = None
+
+    @model_validator(mode="after")
+    def one_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide either ids or filter")
+        return self
+
+
+class ReportStatusResult(BaseModel):
+    id: int
+    result: Literal["updated", "unchanged", "conflict", "not_found"]
+    status: str | None = None
 
 
 class ReportOut(BaseModel):
@@ -17,11 +56,29 @@ class ReportOut(BaseModel):
     description: str
     status: str
     category: str
+    department: str | None = None
     priority: str
+    priority_score: int = 0
+    enrichment_state: str | None = None
     ai_summary: str | None = None
     suspicious_flag: bool
+    duplicate_of: list[int] | None = None
     user_id: int
     photo_url: str | None = None
+    model_version: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
 
     class Config:
         from_attributes = True
+
+
+class ReportNearbyOut(ReportOut):
+    distance_m: float | None = None
+
+
+class HotspotOut(BaseModel):
+    cell: str
+    latitude: float
+    longitude: float
+    count: int
@@ -0,0 +1,140 @@
+"""Per-row cost of serializing report listings, before and after the fast path.
+
+Run from the backend directory:
+
+    python -m bench_serialization                  # 500-row pages from 5000 seeded reports
+    python -m bench_serialization --rows 50 500 2000 --repeat 20
+
+It seeds a throwaway SQLite database with enriched-looking reports and times
+three ways of turning one page into a response body:
+
+- ``orm+jsonable_encoder``: ORM objects through FastAPI's introspection,
+  which was the /reports/admin/all path without a response_model.
+- ``orm+ReportOut``: ORM objects validated into ReportOut and dumped, which was
+  the response_model path of GET /reports/.
+- ``columns+orjson``: ReportOut columns selected as tuples and encoded with
+  orjson (app/core/responses.py).
+
+Fetch (query plus object or row construction) and encode are timed
+separately. The last table lists body size and the cost of gzip and brotli
+compression (brotli only if the package is installed).
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def seed(session, Report, count):
+    rng = random.Random(7)
+    words = "water pipe leak pothole street light garbage noise parking blocked driveway graffiti".split()
+    session.execute(
+        Report.__table__.insert(),
+        [
+            {
+                "title": " ".join(rng.choices(words, k=4)).capitalize(),
+                "description": " ".join(rng.choices(words, k=rng.randint(12, 40))),
+                "status": rng.choice(["pending", "in_progress", "resolved"]),
+                "category": rng.choice(["Water/Utilities", "Sanitation", "Noise"]),
+                "department": rng.choice(["Water Dept", "Sanitation Dept", "Police"]),
+                "priority": rng.choice(["Low", "Medium", "High"]),
+                "priority_score": rng.randint(0, 100),
+                "enrichment_state": "done",
+                "ai_summary": " ".join(rng.choices(words, k=10)),
+                "suspicious_flag": False,
+                "duplicate_of": [rng.randint(1, count)] if rng.random() < 0.1 else None,
+                "photo_url": "/photos/" + "%064x" % rng.getrandbits(256),
+                "model_version": "v1",
+                "latitude": 40 + rng.random(),
+                "longitude": -74 + rng.random(),
+                "user_id": 1,
+            }
+            for _ in range(count)
+        ],
+    )
+    session.commit()
+
+
+def time_per_row(fn, rows, repeat):
+    """Median microseconds per row over ``repeat`` calls, and the last result"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1e6 / rows)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare report list serialization paths")
+    parser.add_argument("--reports", type=int, default=5000, help="reports to seed")
+    parser.add_argument("--rows", type=int, nargs="+", default=[500], help="page sizes to time")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(workdir) / 'bench.db'}"
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+
+    from app.core import compression
+    from app.db.database import SessionLocal
+    from app.db.init_db import init_db
+    from app.models.report import Report
+    from app.routers.report import REPORT_COLUMNS, REPORT_FIELDS
+    from app.core.responses import rows_response
+    from app.schemas.report import ReportOut
+
+    init_db()
+    adapter = TypeAdapter(list[ReportOut])
+    with SessionLocal() as db:
+        seed(db, Report, args.reports)
+
+        for rows in args.rows:
+            def fetch_orm():
+                db.expunge_all()  # no identity-map hits, like a fresh request session
+                return db.query(Report).order_by(Report.id).limit(rows).all()
+
+            def fetch_columns():
+                return db.query(*REPORT_COLUMNS).order_by(Report.id).limit(rows).all()
+
+            orm_fetch, objects = time_per_row(fetch_orm, rows, args.repeat)
+            column_fetch, tuples = time_per_row(fetch_columns, rows, args.repeat)
+            paths = [
+                ("orm+jsonable_encoder", orm_fetch,
+                 lambda: JSONResponse(jsonable_encoder(objects)).body),
+                ("orm+ReportOut", orm_fetch,
+                 lambda: JSONResponse(adapter.dump_python(
+                     adapter.validate_python(objects, from_attributes=True), mode="json")).body),
+                ("columns+orjson", column_fetch,
+                 lambda: rows_response(REPORT_FIELDS, tuples).body),
+            ]
+
+            print(f"\n{rows} rows per page, median of {args.repeat} (us per row)")
+            print(f"  {'path':<22}{'fetch':>9}{'encode':>9}{'total':>9}{'speedup':>9}")
+            baseline = None
+            for name, fetch, encode in paths:
+                encode_us, body = time_per_row(encode, rows, args.repeat)
+                total = fetch + encode_us
+                baseline = baseline or total
+                print(f"  {name:<22}{fetch:9.1f}{encode_us:9.1f}{total:9.1f}{baseline / total:8.1f}x")
+
+            print(f"  {'body':<22}{'bytes':>9}{'us/row':>9}")
+            print(f"  {'identity':<22}{len(body):9d}{0:9.1f}")
+            for encoding in ("gzip", "br"):
+                if encoding == "br" and compression.brotli is None:
+                    print(f"  {'br':<22}  (pip install brotli)")
+                    continue
+                us, compressed = time_per_row(lambda: compression.compress(body, encoding), rows, args.repeat)
+                print(f"  {encoding:<22}{len(compressed):9d}{us:9.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""Load test for the FixIt API.
+
+Run from the backend directory:
+
+    python -m loadtest                                  # throwaway SQLite DB, 30 s, 32 clients
+    python -m loadtest --concurrency 64 --duration 60 --server-workers 4
+    python -m loadtest --database-url postgresql://postgres:pw@localhost/fixit_loadtest
+    python -m loadtest --url http://127.0.0.1:8000      # an already running server
+    python -m loadtest --out run.json --baseline previous.json
+
+Unless --url is given, it creates the schema in a fresh database, starts
+``uvicorn app.main:app`` on a free port and waits for /health/ready. It then
+seeds citizen and admin accounts plus reports, and drives a weighted mix of
+register, login, create-report, list-reports and status-update requests from
+concurrent clients. Each client
+has its own seeded RNG, so the request sequence is reproducible. It reports
+requests/s, latency percentiles and error rates per endpoint, and can write
+them as JSON and compare them against a previous run.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+BASE_DIR = Path(__file__).resolve().parent
+CSV_PATH = BASE_DIR / "ai" / "dataset.csv"
+
+DEFAULT_MIX = "list=50,create=25,login=10,status=10,register=5"
+STATUSES = ("pending", "in_progress", "resolved")
+PASSWORD = "loadtest-password"
+
+FALLBACK_DESCRIPTIONS = [
+    "Water pipe burst near the main road",
+    "Large pothole in front of the school",
+    "Loud music from the apartment upstairs",
+    "Car blocking my driveway",
+    "Garbage has not been collected for a week",
+    "Street light out on the corner",
+]
+
+
+def load_descriptions(limit=2000):
+    if not CSV_PATH.exists():
+        return FALLBACK_DESCRIPTIONS
+    with open(CSV_PATH, newline="", encoding="utf-8") as f:
+        rows = (row.get("description") for row in csv.DictReader(f))
+        descriptions = [d for _, d in zip(range(limit), (d for d in rows if d))]
+    return descriptions or FALLBACK_DESCRIPTIONS
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise SystemExit(f"Unknown operation {name!r}; choose from {', '.join(OPERATIONS)}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+# -- server ---------------------------------------------------------------------
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(database_url, workers, workdir):
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "PHOTO_STORAGE_DIR": str(Path(workdir) / "media"),
+        # Keep the server from rejecting argon2 work during login/register bursts
+        "CPU_POOL_MAX_QUEUE": os.environ.get("CPU_POOL_MAX_QUEUE", "1024"),
+    }
+    subprocess.run([sys.executable, "-m", "app.db.init_db"], cwd=BASE_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=BASE_DIR, env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(url + "/health/ready", timeout=1).status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("Server was not ready within 60 s")
+
+
+# -- state shared by the clients -----------------------------------------------
+
+
+class State:
+    def __init__(self, run_id, descriptions):
+        self.run_id = run_id
+        self.descriptions = descriptions
+        self.users = []  # (email, headers)
+        self.admin = None
+        self.report_ids = []
+        self.registered = 0
+
+
+async def _register(client, email, role="citizen"):
+    r = await client.post("/users/", json={"name": email.split("@")[0], "email": email,
+                                           "password": PASSWORD, "role": role})
+    r.raise_for_status()
+
+
+async def _login(client, email):
+    r = await client.post("/users/login", data={"username": email, "password": PASSWORD})
+    r.raise_for_status()
+    return {"Authorization": "Bearer " + r.json()["access_token"]}
+
+
+async def seed(client, state, users, reports, concurrency):
+    limit = asyncio.Semaphore(concurrency)
+
+    async def account(email, role):
+        async with limit:
+            await _register(client, email, role)
+            return email, await _login(client, email)
+
+    emails = [f"lt-{state.run_id}-{i}@example.com" for i in range(users)]
+    admin_email = f"lt-{state.run_id}-admin@example.com"
+    accounts = await asyncio.gather(account(admin_email, "admin"), *(account(e, "citizen") for e in emails))
+    state.admin, state.users = accounts[0][1], list(accounts[1:])
+
+    rng = random.Random(0)
+    for start in range(0, reports, 100):
+        _, headers = state.users[(start // 100) % len(state.users)]
+        batch = [{"title": "Seeded report", "description": rng.choice(state.descriptions)}
+                 for _ in range(min(100, reports - start))]
+        r = await client.post("/reports/bulk", json=batch, headers=headers)
+        r.raise_for_status()
+        state.report_ids.extend(item["id"] for item in r.json())
+
+
+# -- operations -------------------------------------------------------------------
+
+
+async def op_register(client, state, rng):
+    state.registered += 1
+    email = f"lt-{state.run_id}-new{state.registered}@example.com"
+    return await client.post("/users/", json={"name": "Load Test", "email": email, "password": PASSWORD})
+
+
+async def op_login(client, state, rng):
+    email, _ = rng.choice(state.users)
+    return await client.post("/users/login", data={"username": email, "password": PASSWORD})
+
+
+async def op_create(client, state, rng):
+    _, headers = rng.choice(state.users)
+    r = await client.post("/reports/", json={"title": "Load test report",
+                                             "description": rng.choice(state.descriptions)}, headers=headers)
+    if r.status_code == 200:
+        state.report_ids.append(r.json()["id"])
+    return r
+
+
+async def op_list(client, state, rng):
+    # One in five listings is an admin view of a status queue
+    if rng.random() < 0.2:
+        return await client.get("/reports/admin/all", params={"status": rng.choice(STATUSES), "limit": 50},
+                                headers=state.admin)
+    _, headers = rng.choice(state.users)
+    return await client.get("/reports/", params={"limit": 50}, headers=headers)
+
+
+async def op_status(client, state, rng):
+    report_id = rng.choice(state.report_ids)
+    return await client.put(f"/reports/{report_id}/status", json={"status": rng.choice(STATUSES)},
+                            headers=state.admin)
+
+
+OPERATIONS = {
+    "register": op_register,
+    "login": op_login,
+    "create": op_create,
+    "list": op_list,
+    "status": op_status,
+}
+
+
+# -- driver ---------------------------------------------------------------------------
+
+
+async def client_loop(client, state, mix, rng, measure_from, deadline, samples):
+    names, weights = list(mix), list(mix.values())
+    while True:
+        name = rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        if started >= deadline:
+            return
+        try:
+            response = await OPERATIONS[name](client, state, rng)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        if started >= measure_from:
+            samples.append((name, time.perf_counter() - started, ok))
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, seconds):
+    by_op = {}
+    for name, latency, ok in samples:
+        by_op.setdefault(name, []).append((latency, ok))
+    by_op["total"] = [(latency, ok) for _, latency, ok in samples]
+
+    results = {}
+    for name, items in by_op.items():
+        latencies = sorted(latency for latency, _ in items)
+        errors = sum(1 for _, ok in items if not ok)
+        results[name] = {
+            "requests": len(items),
+            "rps": round(len(items) / seconds, 1),
+            "error_rate": round(errors / len(items), 4) if items else 0.0,
+            **{f"p{q}_ms": round(percentile(latencies, q) * 1000, 2) for q in (50, 90, 95, 99)},
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        }
+    return results
+
+
+async def run(url, args, descriptions):
+    state = State(datetime.now().strftime("%H%M%S%f"), descriptions)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout) as client:
+        seeding = time.perf_counter()
+        await seed(client, state, args.users, args.seed_reports, args.concurrency)
+        print(f"Seeded {len(state.users)} users and {len(state.report_ids)} reports "
+              f"in {time.perf_counter() - seeding:.1f}s")
+
+        samples = []
+        start = time.perf_counter()
+        measure_from = start + args.warmup
+        deadline = measure_from + args.duration
+        mix = parse_mix(args.mix)
+        await asyncio.gather(*(
+            client_loop(client, state, mix, random.Random(args.seed + i), measure_from, deadline, samples)
+            for i in range(args.concurrency)
+        ))
+    return summarize(samples, args.duration)
+
+
+def print_table(results):
+    print(f"\n{'endpoint':<10} {'requests':>9} {'req/s':>8} {'errors':>7} "
+          f"{'p50 ms':>8} {'p90 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, r in sorted(results.items(), key=lambda item: item[0] == "total"):
+        print(f"{name:<10} {r['requests']:>9} {r['rps']:>8.1f} {r['error_rate']:>7.2%} {r['p50_ms']:>8.1f} "
+              f"{r['p90_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}")
+
+
+def compare(results, baseline, tolerance):
+    """Regressions beyond tolerance in throughput, p95 latency or error rate"""
+    regressions = []
+    for name, old in baseline.get("results", {}).items():
+        new = results.get(name)
+        if new is None:
+            continue
+        if new["rps"] < old["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: req/s {old['rps']} -> {new['rps']}")
+        if new["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {old['p95_ms']} ms -> {new['p95_ms']} ms")
+        if new["error_rate"] > old["error_rate"] + 0.01:
+            regressions.append(f"{name}: error rate {old['error_rate']:.2%} -> {new['error_rate']:.2%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the FixIt API")
+    parser.add_argument("--url", help="target an already running server instead of starting one")
+    parser.add_argument("--database-url", help="database for the started server (default: throwaway SQLite)")
+    parser.add_argument("--server-workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before the run")
+    parser.add_argument("--users", type=int, default=20, help="citizen accounts to seed")
+    parser.add_argument("--seed-reports", type=int, default=1000, help="reports to seed")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed for the request sequence")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request timeout in seconds")
+    parser.add_argument("--out", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="previous --out file; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+    parse_mix(args.mix)
+
+    process = None
+    with tempfile.TemporaryDirectory(prefix="fixit-loadtest-") as workdir:
+        database_url = args.database_url or f"sqlite:///{Path(workdir) / 'loadtest.db'}"
+        url = args.url
+        if url is None:
+            process, url = start_server(database_url, args.server_workers, workdir)
+            print(f"Started app.main:app at {url} ({args.server_workers} worker(s), {database_url.split(':')[0]})")
+        try:
+            results = asyncio.run(run(url, args, load_descriptions()))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+
+    print_table(results)
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "target": args.url or f"local ({database_url.split(':')[0]}, {args.server_workers} worker(s))",
+        "config": {k: v for k, v in vars(args).items() if k in
+                   ("concurrency", "duration", "warmup", "users", "seed_reports", "mix", "seed")},
+        "results": results,
+    }
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+        print(f"\nWrote {args.out}")
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
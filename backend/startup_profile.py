@@ -0,0 +1,83 @@
+"""Profile API cold start: import time of app.main and time until the model is warm.
+
+Run from the backend directory:
+
+    python -m startup_profile                     # 5 fresh interpreters per engine
+    python -m startup_profile --runs 10 --engines numpy sklearn --top 15
+
+Each run is a fresh interpreter, so the numbers match a new worker process.
+The ``-X importtime`` breakdown of the last run lists the slowest top-level
+imports.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+import app.main
+imported = time.perf_counter() - t0
+from ai.predict import registry
+registry.ensure_loaded()
+print(json.dumps({"import_s": imported, "ready_s": time.perf_counter() - t0,
+                  "engine": registry.active.engine}))
+"""
+
+
+def run_probe(env):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE], cwd=BASE_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def slowest_imports(importtime_log, top):
+    """Largest cumulative times among modules imported directly by app.main's tree"""
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "|" not in line[13:]:
+            continue
+        _, cumulative, name = line[12:].split("|")
+        if cumulative.strip().isdigit() and name.startswith("   ") and not name.startswith("     "):
+            rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile app.main import and model warm-up")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--engines", nargs="+", default=["numpy", "sklearn"], help="MODEL_ENGINE values")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        base_env = {
+            **os.environ,
+            # An unreachable database must not matter for import
+            "DATABASE_URL": os.environ.get("DATABASE_URL", f"sqlite:///{Path(workdir) / 'profile.db'}"),
+            "PYTHONWARNINGS": "ignore",
+        }
+        for engine in args.engines:
+            env = {**base_env, "MODEL_ENGINE": engine}
+            runs = [run_probe(env) for _ in range(args.runs)]
+            imports = [r["import_s"] * 1000 for r, _ in runs]
+            ready = [r["ready_s"] * 1000 for r, _ in runs]
+            print(f"\nMODEL_ENGINE={engine} (served by {runs[-1][0]['engine']}), {args.runs} runs")
+            print(f"  import app.main:     median {statistics.median(imports):7.1f} ms  (min {min(imports):.1f})")
+            print(f"  import + model warm: median {statistics.median(ready):7.1f} ms  (min {min(ready):.1f})")
+            print("  slowest imports (cumulative):")
+            for ms, name in slowest_imports(runs[-1][1], args.top):
+                print(f"    {ms:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
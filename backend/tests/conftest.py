@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+# Before any app import: the engine and photo store are configured at import time
+_workdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_workdir) / 'test.db'}"
+os.environ["PHOTO_STORAGE_DIR"] = str(Path(_workdir) / "photos")
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.db.init_db import init_db
+    from app.main import app
+
+    init_db()
+    with TestClient(app) as client:
+        yield client
+
+
+def _login(client, email):
+    response = client.post("/users/login", data={"username": email, "password": "pw"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def citizen(client):
+    client.post("/users/", json={"name": "citizen", "email": "citizen@example.com", "password": "pw"})
+    return _login(client, "citizen@example.com")
+
+
+@pytest.fixture(scope="session")
+def admin(client):
+    from app.core.security import hash_password
+    from app.db.database import SessionLocal
+    from app.models.user import User
+
+    with SessionLocal() as db:
+        db.add(User(name="admin", email="admin@example.com", password=hash_password("pw"), role="admin"))
+        db.commit()
+    return _login(client, "admin@example.com")
@@ -0,0 +1,34 @@
+from app.db import report_stats
+from app.db.database import SessionLocal
+from app.models.report import Report
+from app.models.report_stat import ReportStat
+
+
+def _stats():
+    with SessionLocal() as db:
+        return report_stats.read_stats(db)
+
+
+def test_status_update_moves_stats(client, citizen, admin):
+    report = client.post("/reports/", json={"title": "Leak", "description": "Water leak"}, headers=citizen).json()
+    before = _stats()
+
+    response = client.put(f"/reports/{report['id']}/status", json={"status": "resolved"}, headers=admin)
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "resolved"
+    after = _stats()
+    assert after["by_status"].get("resolved", 0) == before["by_status"].get("resolved", 0) + 1
+
+
+def test_unknown_status_is_rejected(client, citizen, admin):
+    report = client.post("/reports/", json={"title": "Pothole", "description": "Deep pothole"}, headers=citizen).json()
+    before = _stats()
+
+    response = client.put(f"/reports/{report['id']}/status", json={"status": "bogus"}, headers=admin)
+
+    assert response.status_code == 422
+    assert _stats() == before
+    with SessionLocal() as db:
+        assert db.get(Report, report["id"]).status == report["status"]
+        assert not db.query(ReportStat).filter(ReportStat.status == "bogus").count()
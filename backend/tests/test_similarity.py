@@ -0,0 +1,19 @@
+from ai.similarity import MinHashLSH
+
+
+def test_readd_at_capacity_keeps_the_readded_item():
+    index = MinHashLSH(capacity=2)
+    texts = {1: "water leak on main road", 2: "pothole near the school", 3: "street light is broken"}
+    signatures = {item_id: index.signature(text) for item_id, text in texts.items()}
+
+    index.add(1, signatures[1])
+    index.add(2, signatures[2])
+    index.add(1, signatures[1])  # re-added: now newer than 2
+    index.add(3, signatures[3])
+
+    assert 1 in index
+    assert 2 not in index
+    assert 3 in index
+    assert len(index) == 2
+    assert index.query(signatures[1]) == [1]
+    assert index.query(signatures[2]) == []
@@ -6,8 +6,10 @@ import Navbar from "../Components/Navbar";
 export default function CreateReport() {
   const [title, setTitle] = useState("");
   const [description, setDescription] = useState("");
-  const [photoUrl, setPhotoUrl] = useState("");
+  const [photoFile, setPhotoFile] = useState(null);
   const [photoPreview, setPhotoPreview] = useState(null);
+  const [location, setLocation] = useState(null);
+  const [locating, setLocating] = useState(false);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
   const [success, setSuccess] = useState(false);
@@ -22,14 +24,28 @@ export default function CreateReport() {
   const handlePhotoUpload = (e) => {
     const file = e.target.files[0];
     if (file) {
-      // Show preview
-      const reader = new FileReader();
-      reader.onloadend = () => {
-        setPhotoPreview(reader.result);
-        setPhotoUrl(reader.result); // Store as base64
-      };
-      reader.readAsDataURL(file);
+      // Show preview; the file itself is uploaded as multipart on submit
+      setPhotoFile(file);
+      setPhotoPreview(URL.createObjectURL(file));
+    }
+  };
+
+  const handleLocate = () => {
+    if (!navigator.geolocation) {
+      setError("Location is not available in this browser");
+      return;
     }
+    setLocating(true);
+    navigator.geolocation.getCurrentPosition(
+      (pos) => {
+        setLocation({ latitude: pos.coords.latitude, longitude: pos.coords.longitude });
+        setLocating(false);
+      },
+      () => {
+        setError("Could not get your location");
+        setLocating(false);
+      }
+    );
   };
 
   const handleSubmit = async () => {
@@ -45,10 +61,20 @@ export default function CreateReport() {
     
     setLoading(true);
     try {
+      let photoUrl = null;
+      if (photoFile) {
+        const form = new FormData();
+        form.append("file", photoFile);
+        const upload = await API.post("/photos/", form, {
+          headers: { "Content-Type": "multipart/form-data" },
+        });
+        photoUrl = upload.data.photo_url;
+      }
       const reportData = {
         title,
         description,
-        photo_url: photoUrl || null
+        photo_url: photoUrl,
+        ...(location || {})
       };
       const response = await API.post("/reports/", reportData);
       setAiAnalysis(response.data);
@@ -79,10 +105,14 @@ export default function CreateReport() {
               <div className="text-2xl text-green-600">✓</div>
               <div>
                 <p className="text-green-700 font-bold">Report submitted!</p>
-                <p className="text-green-600 text-sm">AI analysis completed</p>
+                <p className="text-green-600 text-sm">
+                  {aiAnalysis?.enrichment_state === "pending"
+                    ? "AI analysis is running - category and priority will appear in your reports shortly"
+                    : "AI analysis completed"}
+                </p>
               </div>
             </div>
-            {aiAnalysis && (
+            {aiAnalysis && aiAnalysis.enrichment_state !== "pending" && (
               <div className="space-y-3 bg-white p-4 rounded-lg mt-4">
                 <div className="flex justify-between items-center">
                   <span className="text-gray-600 font-medium">Category:</span>
@@ -171,7 +201,7 @@ export default function CreateReport() {
                   <button
                     onClick={() => {
                       setPhotoPreview(null);
-                      setPhotoUrl("");
+                      setPhotoFile(null);
                     }}
                     className="text-sm text-red-600 hover:text-red-700 mt-2 font-medium"
                   >
@@ -181,6 +211,32 @@ export default function CreateReport() {
               )}
             </div>
 
+            {/* Location */}
+            <div>
+              <label className="block text-sm font-bold text-gray-700 mb-2">📍 Location (Optional)</label>
+              {location ? (
+                <div className="flex items-center gap-4">
+                  <span className="text-sm text-gray-700">
+                    {location.latitude.toFixed(5)}, {location.longitude.toFixed(5)}
+                  </span>
+                  <button
+                    onClick={() => setLocation(null)}
+                    className="text-sm text-red-600 hover:text-red-700 font-medium"
+                  >
+                    Remove Location
+                  </button>
+                </div>
+              ) : (
+                <button
+                  onClick={handleLocate}
+                  disabled={loading || locating}
+                  className="px-4 py-2 bg-gray-50 border border-gray-300 text-gray-700 rounded-lg hover:bg-gray-100 disabled:opacity-50 transition"
+                >
+                  {locating ? "Locating..." : "Use my current location"}
+                </button>
+              )}
+            </div>
+
             {/* Submit Button */}
             <button 
               onClick={handleSubmit} 
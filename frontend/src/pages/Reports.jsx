@@ -7,6 +7,8 @@ export default function Reports() {
   const [reports, setReports] = useState([]);
   const [role, setRole] = useState("user");
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -15,7 +17,10 @@ export default function Reports() {
 
     setLoading(true);
     API.get("/reports/", { headers: { Authorization: `Bearer ${token}` } })
-      .then(res => setReports(res.data))
+      .then(res => {
+        setReports(res.data);
+        setNextCursor(res.headers["x-next-after-id"] || null);
+      })
       .catch(err => {
         if (err.response?.status === 401) {
           localStorage.removeItem("token");
@@ -29,6 +34,18 @@ export default function Reports() {
       .catch(() => setRole("user"));
   }, [navigate]);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const res = await API.get("/reports/", { params: { after_id: nextCursor } });
+      setReports(prev => [...prev, ...res.data]);
+      setNextCursor(res.headers["x-next-after-id"] || null);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const updateStatus = async (id, status) => {
     const token = localStorage.getItem("token");
     await API.put(`/reports/${id}/status`, { status }, {
@@ -123,6 +140,16 @@ export default function Reports() {
                   <div className="flex-1">
                     <h4 className="text-lg font-semibold text-gray-800 group-hover:text-indigo-600 transition">{r.title}</h4>
                     <p className="text-gray-600 mt-2 text-sm leading-relaxed">{r.description}</p>
+                    {r.photo_url?.startsWith("/photos/") && (
+                      <a href={`${API.defaults.baseURL}${r.photo_url}`} target="_blank" rel="noreferrer">
+                        <img
+                          src={`${API.defaults.baseURL}${r.photo_url}/thumbnail`}
+                          alt="Report photo"
+                          loading="lazy"
+                          className="mt-3 max-h-32 rounded-lg border border-gray-200"
+                        />
+                      </a>
+                    )}
                   </div>
                   <div className="flex flex-col gap-2 items-end">
                     <span className={`px-3 py-1 rounded-lg text-xs font-bold uppercase whitespace-nowrap ${getStatusStyles(r.status)}`}>
@@ -167,6 +194,19 @@ export default function Reports() {
             ))}
           </div>
         )}
+
+        {/* Pagination */}
+        {!loading && nextCursor && (
+          <div className="text-center mt-8">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="bg-white border border-gray-300 hover:border-indigo-300 text-gray-700 font-medium px-6 py-2 rounded-lg transition disabled:opacity-50"
+            >
+              {loadingMore ? "Loading..." : "Load more"}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );